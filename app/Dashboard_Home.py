@@ -1,4 +1,5 @@
 import streamlit as st
+from utils.warmup import start_warmup
 
 # Set page config to make it wider
 st.set_page_config(
@@ -59,6 +60,25 @@ st.markdown("""
 st.title("Dashboard Home")
 st.markdown("##### Select a dashboard to view detailed metrics")
 
+# Datasets are loaded into the shared cache in the background once per server process
+warmup = start_warmup()
+polling = not warmup.ready.is_set()
+
+@st.fragment(run_every=1 if polling else None)
+def warmup_status():
+    if not warmup.ready.is_set():
+        st.progress(warmup.progress, text="Preparing dashboards: loading datasets in the background…")
+        return
+    if warmup.failed:
+        st.warning("Dashboards ready; could not preload: " + ", ".join(label for label, _ in warmup.failed))
+    else:
+        st.caption(f"✅ Dashboards ready: {len(warmup.loaded)} datasets and aggregates preloaded in {warmup.seconds:.1f}s")
+    if polling:
+        # Rerun the page once so the status stops polling
+        st.rerun()
+
+warmup_status()
+
 def dashboard_tile(title, kpi1_label, kpi1_value, kpi2_label, kpi2_value, dashboard_url):
     html = f"""
     <a href="{dashboard_url}" target="_self" style="text-decoration: none;">
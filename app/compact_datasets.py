@@ -0,0 +1,139 @@
+"""Lossless compaction of the CSV files in app/datasets.
+
+Each CSV is parsed the way the app reads it (utils.datasets.read_dataset) and written next to
+it as a dictionary-encoded, zstd-compressed Parquet file. The Parquet file is read back and
+checked against the CSV frame: same row count, same columns and dtypes, same row-hash checksum
+and equal values. Only then is the CSV removed; the app reads the Parquet file from then on.
+Every row is kept, so the KPIs are the same as on the full CSV.
+
+    python app/compact_datasets.py              compact every CSV, report sizes and load times
+    python app/compact_datasets.py --keep-csv   also keep the CSVs
+    python app/compact_datasets.py --dry-run    report and verify only, write nothing
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.datasets import DATASETS_DIR, compacted_path, read_dataset
+
+LOAD_REPEATS = 3
+
+
+def frame_checksum(df):
+    """Order-sensitive checksum of a frame's values, independent of its storage format."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    weights = pd.util.hash_array(pd.RangeIndex(len(df)).to_numpy())
+    return int((row_hashes * weights).sum())
+
+
+def load_seconds(path):
+    """Best of LOAD_REPEATS reads, as the app reads the file."""
+    best = float("inf")
+    for _ in range(LOAD_REPEATS):
+        start = time.perf_counter()
+        read_dataset(path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def write_parquet(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    pq.write_table(table, path, use_dictionary=True, compression="zstd")
+
+
+def verify(expected, actual):
+    """Problems found comparing the CSV frame with the Parquet frame; empty when identical."""
+    if len(expected) != len(actual):
+        return [f"row count {len(expected)} != {len(actual)}"]
+    if list(expected.columns) != list(actual.columns):
+        return ["columns differ"]
+    problems = [
+        f"{column}: dtype {expected[column].dtype} != {actual[column].dtype}"
+        for column in expected.columns
+        if expected[column].dtype != actual[column].dtype
+    ]
+    if frame_checksum(expected) != frame_checksum(actual):
+        problems.append("checksum differs")
+    if not expected.equals(actual):
+        problems.append("values differ")
+    return problems
+
+
+def compact(csv_path, keep_csv=False, dry_run=False):
+    """Compact one CSV. Returns a report row, or None when the file was left as it was."""
+    name = os.path.basename(csv_path)
+    parquet_path = compacted_path(csv_path)
+    df = read_dataset(csv_path)
+
+    # Written beside the target and only moved into place once verified
+    fd, tmp_path = tempfile.mkstemp(suffix=".parquet", dir=os.path.dirname(csv_path))
+    os.close(fd)
+    try:
+        write_parquet(df, tmp_path)
+        problems = verify(df, read_dataset(tmp_path))
+        if problems:
+            print(f"{name}: not compacted, {'; '.join(problems)}")
+            return None
+        row = {
+            "file": name,
+            "rows": len(df),
+            "csv_mb": os.path.getsize(csv_path) / 2**20,
+            "parquet_mb": os.path.getsize(tmp_path) / 2**20,
+            "csv_load_s": load_seconds(csv_path),
+            "parquet_load_s": load_seconds(tmp_path),
+        }
+        if not dry_run:
+            os.replace(tmp_path, parquet_path)
+            if not keep_csv:
+                os.remove(csv_path)
+        return row
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keep-csv", action="store_true", help="keep each CSV next to its Parquet file")
+    parser.add_argument("--dry-run", action="store_true", help="verify and report without writing anything")
+    args = parser.parse_args()
+
+    csv_files = sorted(name for name in os.listdir(DATASETS_DIR) if name.endswith(".csv"))
+    if not csv_files:
+        print(f"No CSV files in {os.path.normpath(DATASETS_DIR)}")
+        return
+
+    rows = []
+    for name in csv_files:
+        row = compact(os.path.join(DATASETS_DIR, name), keep_csv=args.keep_csv, dry_run=args.dry_run)
+        if row is not None:
+            rows.append(row)
+    if not rows:
+        return
+
+    report = pd.DataFrame(rows).set_index("file")
+    report.loc["total"] = report.sum()
+    report["ratio"] = report["csv_mb"] / report["parquet_mb"]
+    report["speedup"] = report["csv_load_s"] / report["parquet_load_s"]
+    print(report.to_string(formatters={
+        "rows": "{:,.0f}".format,
+        "csv_mb": "{:.2f}".format,
+        "parquet_mb": "{:.2f}".format,
+        "csv_load_s": "{:.3f}".format,
+        "parquet_load_s": "{:.3f}".format,
+        "ratio": "{:.1f}x".format,
+        "speedup": "{:.1f}x".format,
+    }))
+    if args.dry_run:
+        print("\nDry run: nothing written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# export.py
+# On-demand downloads shared by the dashboard pages. Nothing is serialized until
+# the user asks for a file; finished files are cached by (dataset fingerprint, filters, format).
+import gzip
+import hashlib
+import io
+import os
+
+import streamlit as st
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+CHUNK_ROWS = 50_000
+
+
+def file_fingerprint(*paths):
+    """Cheap fingerprint of the source files (path, size, modified time)."""
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def iter_export_chunks(df, fmt):
+    """Yield the serialized file in chunks of CHUNK_ROWS rows."""
+    if fmt == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        buffer = io.BytesIO()
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pq.ParquetWriter(buffer, table.schema, compression="zstd") as writer:
+            for batch in table.to_batches(max_chunksize=CHUNK_ROWS):
+                writer.write_batch(batch)
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+        return
+
+    compressor = gzip.GzipFile if fmt == "CSV (gzip)" else None
+    buffer = io.BytesIO()
+    stream = compressor(fileobj=buffer, mode="wb") if compressor else buffer
+    stream.write(df.head(0).to_csv(index=False).encode("utf-8"))
+    for start in range(0, len(df), CHUNK_ROWS):
+        stream.write(df.iloc[start:start + CHUNK_ROWS].to_csv(index=False, header=False).encode("utf-8"))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if compressor:
+        stream.close()
+    yield buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_export(fingerprint, filters, fmt, _df):
+    """Assemble the chunks into the final file. `_df` is not hashed; the cache key is
+    the dataset fingerprint plus the filter state that produced it."""
+    return b"".join(iter_export_chunks(_df, fmt))
+
+
+def export_button(df, fingerprint, filters, file_name, label="Download", key="export"):
+    """Format picker plus a two-step download: "Prepare" builds (or reuses) the file,
+    then a regular download button serves it. Changing the filters drops the request."""
+    fmt = st.selectbox("File format", list(EXPORT_FORMATS), key=f"{key}_format")
+    extension, mime = EXPORT_FORMATS[fmt]
+    filter_state = tuple(sorted((name, str(value)) for name, value in filters.items()))
+    request = (fingerprint, filter_state, fmt)
+
+    if st.button(f"Prepare {fmt} file", key=f"{key}_prepare"):
+        st.session_state[f"{key}_request"] = request
+
+    if st.session_state.get(f"{key}_request") != request:
+        return
+
+    with st.spinner("Preparing file..."):
+        data = build_export(fingerprint, filter_state, fmt, df)
+    st.download_button(
+        label=label,
+        data=data,
+        file_name=f"{file_name}.{extension}",
+        mime=mime,
+        key=f"{key}_download"
+    )
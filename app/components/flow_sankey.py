@@ -0,0 +1,43 @@
+# flow_sankey.py
+# Sankey diagram for Step 1 -> Step 2 -> Step 3 dashboard flows.
+import numpy as np
+
+STAGE_COLORS = ['#90cdf4', '#fde68a', '#bbf7d0']
+
+
+def sankey_figure(flows, paths, height=600):
+    """`flows` has layer (0 = Step 1->2, 1 = Step 2->3), source, target and count columns."""
+    import plotly.graph_objects as go
+
+    # A path gets one node per step it appears in: node key = step * n_paths + path_id
+    n_paths = len(paths)
+    source_keys = flows['layer'].to_numpy() * n_paths + flows['source'].to_numpy()
+    target_keys = (flows['layer'].to_numpy() + 1) * n_paths + flows['target'].to_numpy()
+    node_keys, node_index = np.unique(np.concatenate([source_keys, target_keys]), return_inverse=True)
+    step, path_id = np.divmod(node_keys, n_paths)
+    labels = paths['label'].to_numpy()[path_id]
+
+    fig = go.Figure(go.Sankey(
+        arrangement="snap",
+        node=dict(
+            label=labels.tolist(),
+            customdata=[f"Step {s + 1}" for s in step],
+            hovertemplate="%{customdata}: %{label}<br>%{value}<extra></extra>",
+            color=[STAGE_COLORS[s] for s in step],
+            pad=12,
+            thickness=14,
+            line=dict(color="rgba(0,0,0,0.2)", width=0.5)
+        ),
+        link=dict(
+            source=node_index[:len(flows)],
+            target=node_index[len(flows):],
+            value=flows['count'].to_numpy(),
+            color="rgba(26, 54, 93, 0.2)"
+        )
+    ))
+    fig.update_layout(
+        height=height,
+        margin=dict(l=10, r=10, t=20, b=10),
+        font=dict(color='black', size=10)
+    )
+    return fig
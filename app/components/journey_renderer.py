@@ -0,0 +1,126 @@
+# journey_renderer.py
+# Batched renderer for the step-wise user journeys. Every transition becomes a lane in a
+# single figure, and the figure always has the same handful of traces (one filled trace per
+# box color, one for the labels, two for the arrows), however many transitions are drawn.
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+STEP_COLUMNS = ['Step 1_Clean', 'Step 2_Clean', 'Step 3_Clean']
+X_POS = np.array([0, 1.5, 3])  # Spread out for longer boxes
+BOX_DX = np.array([-0.5, 0.5, 0.5, -0.5, -0.5, np.nan])
+BOX_DY = np.array([-0.2, -0.2, 0.2, 0.2, -0.2, np.nan])
+LANE_HEIGHT_PX = 60
+
+
+def journey_figure(steps_df, color_map, default_color, lane_labels=None, webgl=False):
+    """Draw every row of `steps_df` (Step 1/2/3 labels) as one lane of a single figure."""
+    import plotly.graph_objects as go
+
+    scatter = go.Scattergl if webgl else go.Scatter
+    labels = steps_df[STEP_COLUMNS].to_numpy(dtype=object)
+    n_lanes = len(labels)
+
+    lane_y = -np.arange(n_lanes, dtype=float)
+    center_x = np.tile(X_POS, n_lanes)
+    center_y = np.repeat(lane_y, len(X_POS))
+    flat_labels = labels.ravel()
+    box_colors = pd.Series(flat_labels).map(color_map).fillna(default_color).to_numpy()
+
+    fig = go.Figure()
+
+    # Boxes: None-separated polygons, one trace per fill color
+    for color in pd.unique(box_colors):
+        idx = box_colors == color
+        fig.add_trace(scatter(
+            x=(center_x[idx, None] + BOX_DX).ravel(),
+            y=(center_y[idx, None] + BOX_DY).ravel(),
+            mode="lines",
+            fill="toself",
+            fillcolor=color,
+            opacity=0.8,
+            line=dict(color="rgba(0,0,0,0.1)", width=1),
+            hoverinfo="skip",
+            showlegend=False
+        ))
+
+    # Labels
+    fig.add_trace(scatter(
+        x=center_x, y=center_y,
+        mode="text",
+        text=flat_labels,
+        textfont=dict(size=16, color="#333"),
+        hoverinfo="text",
+        showlegend=False
+    ))
+
+    # Arrows: None-separated line segments between the boxes plus triangle markers as heads
+    arrow_start = np.tile(X_POS[:-1] + 0.5, n_lanes)
+    arrow_end = np.tile(X_POS[1:] - 0.7, n_lanes)
+    arrow_y = np.repeat(lane_y, len(X_POS) - 1)
+    fig.add_trace(scatter(
+        x=np.column_stack([arrow_start, arrow_end, np.full_like(arrow_end, np.nan)]).ravel(),
+        y=np.column_stack([arrow_y, arrow_y, np.full_like(arrow_y, np.nan)]).ravel(),
+        mode="lines",
+        line=dict(color="gray", width=1.5),
+        hoverinfo="skip",
+        showlegend=False
+    ))
+    fig.add_trace(scatter(
+        x=arrow_end, y=arrow_y,
+        mode="markers",
+        marker=dict(symbol="triangle-right", size=9, color="gray"),
+        hoverinfo="skip",
+        showlegend=False
+    ))
+
+    yaxis = dict(visible=False, range=[-n_lanes + 0.5, 0.5], fixedrange=True)
+    if lane_labels is not None:
+        yaxis.update(visible=True, showgrid=False, zeroline=False, tickvals=lane_y, ticktext=lane_labels)
+
+    fig.update_layout(
+        height=max(150, LANE_HEIGHT_PX * n_lanes + 40),
+        margin=dict(l=10, r=10, t=10, b=10),
+        xaxis=dict(visible=False, range=[-0.6, 3.6], fixedrange=True),
+        yaxis=yaxis,
+        plot_bgcolor="white",
+        hovermode="closest",
+    )
+    return fig
+
+
+def render_journey_groups(df, color_map, default_color, key="journey", groups_per_page=5):
+    """Render one figure per (user, week) group, a page of groups at a time, or the whole
+    selection as a single WebGL figure."""
+    group_keys = df[['capstone_name', 'Week Number']].drop_duplicates().sort_values(['capstone_name', 'Week Number'])
+    group_keys = list(group_keys.itertuples(index=False, name=None))
+    if not group_keys:
+        st.info("No journeys for the current selection.")
+        return
+
+    single_figure = st.toggle("Show all journeys in one figure (WebGL)", key=f"{key}_single")
+    if single_figure:
+        ordered = df.sort_values(['capstone_name', 'Week Number'], kind="stable")
+        lane_labels = (ordered['capstone_name'] + " | " + ordered['Week Number'].astype(str)).where(
+            ~ordered[['capstone_name', 'Week Number']].duplicated(), ""
+        )
+        st.plotly_chart(
+            journey_figure(ordered, color_map, default_color, lane_labels=lane_labels.tolist(), webgl=True),
+            use_container_width=True
+        )
+        return
+
+    page_count = -(-len(group_keys) // groups_per_page)
+    page = st.number_input(
+        f"Page (of {page_count})", min_value=1, max_value=page_count, step=1, key=f"{key}_page"
+    ) if page_count > 1 else 1
+
+    page_keys = group_keys[(page - 1) * groups_per_page: page * groups_per_page]
+    page_df = df.set_index(['capstone_name', 'Week Number']).loc[page_keys]
+    for user, week in page_keys:
+        st.markdown(f"**{user} | Week: {week}**")
+        st.plotly_chart(
+            journey_figure(page_df.loc[[(user, week)]], color_map, default_color),
+            use_container_width=True
+        )
+        st.markdown("---")
@@ -0,0 +1,73 @@
+# paginated_table.py
+# Server-side paginated table. Only the visible page is sliced out of the filtered
+# frame and sent to the browser, instead of the whole selection.
+import numpy as np
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def format_row_count(count):
+    if count >= 1_000_000:
+        return f"~{count / 1_000_000:.1f}M"
+    if count >= 10_000:
+        return f"~{count / 1_000:.0f}K"
+    return f"{count:,}"
+
+
+def sorted_row_ids(column, ascending):
+    """Positional row ids ordered by a single column (NaNs last)."""
+    values = column.reset_index(drop=True)
+    return values.sort_values(ascending=ascending, na_position="last", kind="stable").index.to_numpy()
+
+
+def paginated_table(df, key, columns=None, default_page_size=50):
+    """Render `df` one page at a time with sort, column projection and page navigation."""
+    all_columns = list(df.columns)
+    default_columns = columns if columns is not None else all_columns
+
+    opt_col1, opt_col2, opt_col3, opt_col4 = st.columns([4, 2, 1, 1])
+    with opt_col1:
+        shown_columns = st.multiselect("Columns", all_columns, default=default_columns, key=f"{key}_columns")
+    with opt_col2:
+        sort_column = st.selectbox("Sort by", ["None"] + all_columns, key=f"{key}_sort")
+    with opt_col3:
+        descending = st.checkbox("Descending", key=f"{key}_descending")
+    with opt_col4:
+        page_size = st.selectbox(
+            "Rows per page", PAGE_SIZES,
+            index=PAGE_SIZES.index(default_page_size) if default_page_size in PAGE_SIZES else 0,
+            key=f"{key}_page_size"
+        )
+
+    # The filtered row-id set; only its sort order is computed, not a sorted copy of the frame
+    total_rows = len(df)
+    if sort_column != "None":
+        row_ids = sorted_row_ids(df[sort_column], ascending=not descending)
+    else:
+        row_ids = np.arange(total_rows)
+
+    page_count = max(1, -(-total_rows // page_size))
+    page_key = f"{key}_page"
+    # Go back to the first page whenever the filtered row set changes size
+    if st.session_state.get(f"{key}_row_count") != total_rows:
+        st.session_state[f"{key}_row_count"] = total_rows
+        st.session_state[page_key] = 1
+
+    nav_col1, nav_col2 = st.columns([1, 4])
+    with nav_col1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, step=1, key=page_key)
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total_rows)
+
+    page_df = df.iloc[row_ids[start:stop]]
+    if shown_columns:
+        page_df = page_df[shown_columns]
+    with nav_col2:
+        st.caption(
+            f"Rows {start + 1 if total_rows else 0:,}–{stop:,} of {format_row_count(total_rows)} "
+            f"· page {page} of {page_count:,}"
+        )
+
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
+    return page_df
@@ -0,0 +1,28 @@
+# person_filter.py
+# Sidebar user filter keyed on the integer person_id from utils/identity.py. The selection is
+# kept in session_state, so picking a user on one page carries over to the other pages.
+import streamlit as st
+
+SELECTED_PERSON_KEY = "selected_person_id"
+
+
+def person_filter(person_ids, identity, label="Select User Name", key="person_filter"):
+    """Sidebar selectbox over person_ids; returns 'All' or the selected person_id."""
+    people = sorted({int(p) for p in person_ids if p is not None}, key=identity.label)
+    options = ['All'] + people
+
+    # Widget state is dropped when switching pages; restore it from the shared selection
+    if key not in st.session_state:
+        selected = st.session_state.get(SELECTED_PERSON_KEY, 'All')
+        st.session_state[key] = selected if selected in options else 'All'
+
+    def remember():
+        st.session_state[SELECTED_PERSON_KEY] = st.session_state[key]
+
+    return st.sidebar.selectbox(
+        label,
+        options,
+        format_func=lambda p: p if p == 'All' else identity.label(p),
+        key=key,
+        on_change=remember
+    )
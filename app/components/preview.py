@@ -0,0 +1,45 @@
+# preview.py
+# Sidebar switch between a dataset's stratified sample (utils/preview.py) and its full data.
+# Pages start on the sample when one is available, so the first render does not wait for the
+# full file; the choice is kept in session_state and shared by every page.
+import streamlit as st
+
+from utils.datasets import dataset_path, sample_available, sample_path
+
+PREVIEW_KEY = "preview_mode"
+
+BADGE_HTML = (
+    '<span style="background:#fef08a; color:#1a365d; border-radius:4px; padding:2px 8px; '
+    'font-size:12px; font-weight:bold;">PREVIEW</span>'
+)
+
+
+def preview_toggle(name, key="preview_toggle"):
+    """Sidebar toggle for dataset `name`; returns (path to load, whether it is the sample)."""
+    if not sample_available(name):
+        return dataset_path(name), False
+
+    # Widget state is dropped when switching pages; restore it from the shared choice
+    if key not in st.session_state:
+        st.session_state[key] = st.session_state.get(PREVIEW_KEY, True)
+
+    def remember():
+        st.session_state[PREVIEW_KEY] = st.session_state[key]
+
+    preview = st.sidebar.toggle(
+        "Preview (sampled)",
+        key=key,
+        on_change=remember,
+        help="Estimates from a stratified sample by subject area, month and user bin. "
+             "Switch off for exact results from the full data."
+    )
+    return (sample_path(name) if preview else dataset_path(name)), preview
+
+
+def preview_badge():
+    """Badge above the KPIs of a page rendering from a sample."""
+    st.markdown(
+        f'{BADGE_HTML} <span style="font-size:12px;">Scaled estimates from a stratified sample, '
+        '± is the 95% confidence interval; distinct counts are lower bounds.</span>',
+        unsafe_allow_html=True
+    )
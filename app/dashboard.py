@@ -2,9 +2,8 @@
  
 import streamlit as st
 import pandas as pd
-import pyodbc
-import plotly.express as px
 from datetime import date
+from components.paginated_table import paginated_table
  
 # Set layout and inject CSS
 st.set_page_config(page_title="ABC App", layout="wide")
@@ -56,6 +55,9 @@ st.markdown("""
 # SQL CONNECTIONS
 @st.cache_data(show_spinner=False)
 def get_hierarchy_from_sql():
+    # pyodbc and its driver manager load on the first query, not at startup
+    import pyodbc
+
     conn = pyodbc.connect(
         r'DRIVER={ODBC Driver 17 for SQL Server};'
         r'SERVER=DESKTOP-41TELJC\SQLEXPRESS;'
@@ -69,6 +71,8 @@ def get_hierarchy_from_sql():
  
 @st.cache_data(show_spinner=False)
 def get_activity_data(source):
+    import pyodbc
+
     conn = pyodbc.connect(
         r'DRIVER={ODBC Driver 17 for SQL Server};'
         r'SERVER=DESKTOP-41TELJC\SQLEXPRESS;'
@@ -395,7 +399,9 @@ else:
             value = activity_df['Oracle_PresentationName'].dropna().nunique()
             st.metric(label=kpi_names[3], value=value)
  
-    # Charts
+    # Charts; plotly is only loaded once a logged-in user reaches them
+    import plotly.express as px
+
     col1, col2 = st.columns(2)
     with col1:
         st.subheader(f"📈 {labels[data_source]['chart_title_prefix']} {st.session_state.kpi_choice}")
@@ -425,5 +431,5 @@ else:
  
     # Raw data
     with st.expander("🧾 View Raw Data Table"):
-        st.dataframe(activity_df)
+        paginated_table(activity_df, key="raw_data")
  
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Import-time budget of the dashboard pages.
+
+The imports heading a page run on every cold rerun after a server start and in every new
+worker, before anything is drawn. This runs each page's import block in a fresh
+interpreter under `python -X importtime`, takes the best of a few runs and checks the time
+spent beyond streamlit itself against the page's budget. Libraries that only a chart or a
+query needs (plotly, pyodbc, altair) belong under the section that uses them instead.
+
+    python app/import_budget.py                  check every page, exit 1 on a breach
+    python app/import_budget.py --top 10         also list the heaviest imports of each page
+
+tests/test_import_budget.py runs the same check under pytest.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Imported by every page before its own modules; its cost is the baseline, not the page's
+BASELINE = ["streamlit"]
+
+# Milliseconds a page's import block may add to the baseline: what it measured on a one-core
+# container with about 50% headroom for noise. pandas is most of it.
+PAGE_BUDGETS_MS = {
+    "Dashboard_Home.py": 50,
+    "dashboard.py": 750,
+    "pages/Bin_Transitions.py": 750,
+    "pages/Dashboard_Trends.py": 750,
+    "pages/Errors.py": 750,
+    "pages/Sent_Notification.py": 750,
+    "pages/Sent_vs_Viewed.py": 750,
+    "pages/User_Journey.py": 750,
+    "pages/User_Journey_Mapping.py": 900,
+}
+
+# Never loaded by a page's import block
+FORBIDDEN = ["altair", "plotly", "pyodbc"]
+
+RUNS = 3
+
+
+def top_level_imports(page):
+    """The import block heading a page script, as source lines.
+
+    Imports placed further down, under the section that uses them, are not counted: they run
+    only once the script gets there, after the page has started drawing.
+    """
+    with open(os.path.join(APP_DIR, page), encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=page)
+    statements = []
+    for node in tree.body:
+        if not isinstance(node, (ast.Import, ast.ImportFrom)):
+            break
+        statements.append(ast.unparse(node))
+    return statements
+
+
+def import_times(statements):
+    """({top-level module: cumulative microseconds}, every module loaded) of one fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "\n".join(statements)],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times, modules = {}, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.add(name.strip())
+        # Top-level entries only; nested ones are already in their parent's cumulative time
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times, modules
+
+
+def best_of(statements, runs):
+    """Import times of the fastest of `runs` interpreters, which is the least disturbed one."""
+    return min((import_times(statements) for _ in range(runs)), key=lambda result: sum(result[0].values()))
+
+
+def measure_baseline(runs=RUNS):
+    """Import times and modules of the baseline alone."""
+    return best_of([f"import {name}" for name in BASELINE], runs)
+
+
+def measure_page(page, baseline, runs=RUNS):
+    """({module: microseconds} a page's import block adds to the baseline, forbidden modules it loads)."""
+    baseline_times, baseline_modules = baseline
+    times, modules = best_of([f"import {name}" for name in BASELINE] + top_level_imports(page), runs)
+    page_times = {name: us for name, us in times.items() if name not in baseline_times}
+    # Anywhere in the tree, also when a util pulls it in; streamlit itself touches plotly.io
+    forbidden = sorted({
+        name for name in modules - baseline_modules
+        for root in FORBIDDEN if name == root or name.startswith(root + ".")
+    })
+    return page_times, forbidden
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=RUNS, help="interpreters per page; the fastest counts")
+    parser.add_argument("--top", type=int, default=0, help="heaviest imports to list per page")
+    args = parser.parse_args()
+
+    baseline = measure_baseline(args.runs)
+    baseline_ms = sum(baseline[0].values()) / 1000
+    print(f"baseline ({', '.join(BASELINE)}): {baseline_ms:.0f}ms")
+
+    breaches = []
+    for page, budget_ms in PAGE_BUDGETS_MS.items():
+        try:
+            page_times, forbidden = measure_page(page, baseline, args.runs)
+        except RuntimeError as e:
+            print(f"{page}: fails to import  {e}")
+            breaches.append(page)
+            continue
+        page_ms = sum(page_times.values()) / 1000
+
+        status = "ok"
+        if page_ms > budget_ms:
+            status = "OVER BUDGET"
+            breaches.append(page)
+        if forbidden:
+            status = f"imports {', '.join(forbidden)}"
+            breaches.append(page)
+        print(f"{page}: {page_ms:.0f}ms of {budget_ms}ms  {status}")
+
+        for name, us in sorted(page_times.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"    {us / 1000:8.1f}ms  {name}")
+
+    if breaches:
+        print(f"{len(set(breaches))} page(s) over their import budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import streamlit as st
+import os
+from utils.datasets import dataset_path
+from utils.loaders import load_bin_transitions
+
+# -------------------- Page Setup --------------------
+st.set_page_config(page_title="Bin Transitions", layout="wide")
+st.title("User Bin Transitions")
+
+# -------------------- Custom CSS --------------------
+st.markdown("""
+<style>
+    .kpi-value {
+        font-size: 24px;
+        font-weight: bold;
+        color: #38bdf8;
+        text-align: center;
+    }
+    .kpi-label {
+        font-size: 14px;
+        color: #000000;
+        text-align: center;
+        margin-bottom: 15px;
+    }
+    .main .block-container {
+        padding-top: 1rem;
+        padding-bottom: 0;
+        max-width: 100%;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+BIN_ORDER = ['Power User', 'Regular User', 'Casual User', 'Inactive']
+BIN_RANK = {'Inactive': 0, 'Casual User': 1, 'Regular User': 2, 'Power User': 3}
+
+# -------------------- Load Data --------------------
+# Precomputed by pipelines/User_binning.ipynb: one row per (quarter pair, from bin, to bin)
+file_path = dataset_path("bin_transition_matrix.csv")
+
+if not os.path.exists(file_path):
+    st.warning("Bin transition matrix not found. Run pipelines/User_binning.ipynb and copy "
+               "bin_transition_matrix.csv to app/datasets.")
+    st.stop()
+
+df = load_bin_transitions(file_path)
+
+if df.empty:
+    st.info("The answers log covers a single quarter so far; transitions appear once a second quarter is logged.")
+    st.stop()
+
+# -------------------- Sidebar Filters --------------------
+st.sidebar.header("Filter Transitions")
+quarter_pairs = sorted(df['Quarter Pair'].unique().tolist())
+selected_pair = st.sidebar.selectbox("Quarter", quarter_pairs, index=len(quarter_pairs) - 1)
+
+pair_df = df[df['Quarter Pair'] == selected_pair]
+
+# -------------------- KPIs --------------------
+from_rank = pair_df['From Bin'].map(BIN_RANK)
+to_rank = pair_df['To Bin'].map(BIN_RANK)
+tracked_users = pair_df['Users'].sum()
+stayed = pair_df.loc[from_rank == to_rank, 'Users'].sum()
+moved_up = pair_df.loc[to_rank > from_rank, 'Users'].sum()
+moved_down = pair_df.loc[to_rank < from_rank, 'Users'].sum()
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.markdown(f"<div class='kpi-value'>{tracked_users:,}</div>", unsafe_allow_html=True)
+    st.markdown("<div class='kpi-label'>Users</div>", unsafe_allow_html=True)
+with col2:
+    st.markdown(f"<div class='kpi-value'>{stayed / tracked_users * 100 if tracked_users else 0:.1f}%</div>", unsafe_allow_html=True)
+    st.markdown("<div class='kpi-label'>Stayed in Bin</div>", unsafe_allow_html=True)
+with col3:
+    st.markdown(f"<div class='kpi-value'>{moved_up:,}</div>", unsafe_allow_html=True)
+    st.markdown("<div class='kpi-label'>Moved Up</div>", unsafe_allow_html=True)
+with col4:
+    st.markdown(f"<div class='kpi-value'>{moved_down:,}</div>", unsafe_allow_html=True)
+    st.markdown("<div class='kpi-label'>Moved Down</div>", unsafe_allow_html=True)
+
+# -------------------- Transition Matrix --------------------
+import plotly.express as px
+
+matrix = (
+    pair_df.pivot_table(index='From Bin', columns='To Bin', values='Users', aggfunc='sum', fill_value=0)
+    .reindex(index=BIN_ORDER, columns=BIN_ORDER, fill_value=0)
+)
+
+fig = px.imshow(
+    matrix,
+    text_auto=True,
+    color_continuous_scale=['#f8fbff', '#90cdf4', '#1a365d'],
+    labels=dict(x=f"Bin in {pair_df['To Quarter'].iloc[0]}", y=f"Bin in {pair_df['From Quarter'].iloc[0]}", color="Users"),
+    aspect="auto"
+)
+fig.update_layout(
+    height=500,
+    margin=dict(l=10, r=10, t=30, b=10),
+    font=dict(color='black'),
+    xaxis=dict(side="top", tickfont=dict(color='black')),
+    yaxis=dict(tickfont=dict(color='black'))
+)
+st.plotly_chart(fig, use_container_width=True)
+
+# -------------------- Trend Across Quarters --------------------
+st.markdown("#### Users Staying in the Same Bin by Quarter")
+df['Stayed'] = df['From Bin'] == df['To Bin']
+trend = df[df['From Bin'] != 'Inactive'].groupby(['Quarter Pair', 'Stayed'])['Users'].sum().unstack(fill_value=0)
+trend = (trend.get(True, 0) / trend.sum(axis=1) * 100).round(1).reset_index(name='Stayed %')
+
+fig_trend = px.line(trend, x='Quarter Pair', y='Stayed %', markers=True, color_discrete_sequence=['#1a365d'])
+fig_trend.update_layout(
+    height=350,
+    font=dict(color='black'),
+    xaxis=dict(title="", tickfont=dict(color='black')),
+    yaxis=dict(title="Stayed %", tickfont=dict(color='black'))
+)
+st.plotly_chart(fig_trend, use_container_width=True)
@@ -1,9 +1,9 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import altair as alt
-import plotly.express as px
-import os
+from components.preview import preview_badge, preview_toggle
+from utils.loaders import load_usage
+from utils.preview import estimate_count, format_distinct, format_estimate, weighted_size
 
 # -------------------- Page Config & Styling --------------------
 st.set_page_config(
@@ -53,30 +53,9 @@ pastel_colors = [
 ]
 
 # -------------------- Load Data --------------------
-@st.cache_data
-def load_data():
-    dir_path = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(dir_path, "..", "datasets", "answers_log_cleaned_1.csv")
-    df = pd.read_csv(file_path)
-    df['Start Timestamp'] = pd.to_datetime(df['Start Timestamp'], errors='coerce')
-    df['Subject Area Name'] = df['Subject Area Name'].fillna('Unknown')
-    df['Parsed Dashboard Name'] = df['Parsed Dashboard Name'].fillna('Unknown')
-    df['Parsed Source Path Name'] = df['Parsed Source Path Name'].fillna('Unknown')
-    df['Dashboard Page'] = df['Dashboard Page'].fillna('Unknown')
-    return df
-
-def load_data_binning():
-    dir_path = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(dir_path, "..", "datasets", "dashboard_usage_summary_by_bin 2.xlsx")
-    df = pd.read_excel(file_path, sheet_name="Sheet1")
-    df['Distinct Users'] = pd.to_numeric(df['Distinct Users'], errors='coerce')
-    df.dropna(subset=['Distinct Users'], inplace=True)
-    df['Dashboard Name Cleaned'] = df['Dashboard Name'].apply(lambda x: str(x).strip().split("/")[-1])
-    return df
-
-# Load datasets
-df = load_data()
-df2 = load_data_binning()
+# The stratified sample from sample_datasets.py when preview is on
+file_path, preview = preview_toggle("answers_log_cleaned_1.csv")
+df, df2 = load_usage(file_path)
 
 with st.sidebar:
     st.markdown('<div class="filter-title">Filters</div>', unsafe_allow_html=True)
@@ -105,6 +84,8 @@ with st.sidebar:
 
 # -------------------- KPI Metrics --------------------
 st.title("Dashboard Usage Analytics")
+if preview:
+    preview_badge()
 
 latest_date = filtered_df['Start Timestamp'].max()
 last_year = latest_date - timedelta(days=365)
@@ -144,16 +125,16 @@ def format_change_arrow(value):
 
 
 
-total_views = filtered_df.shape[0]
-total_reports = filtered_df['Parsed Source Path Name'].nunique()
-total_users = filtered_df['User Name'].nunique()
-views_365 = filtered_df[filtered_df['Start Timestamp'] >= last_year].shape[0]
-views_30 = filtered_df[filtered_df['Start Timestamp'] >= last_30_days].shape[0]
-views_90 = filtered_df[filtered_df['Start Timestamp'] >= last_quarter].shape[0]
+total_views = estimate_count(filtered_df)
+total_reports = format_distinct(filtered_df['Parsed Source Path Name'].nunique(), filtered_df)
+total_users = format_distinct(filtered_df['User Name'].nunique(), filtered_df)
+views_365 = estimate_count(filtered_df[filtered_df['Start Timestamp'] >= last_year])
+views_30 = estimate_count(filtered_df[filtered_df['Start Timestamp'] >= last_30_days])
+views_90 = estimate_count(filtered_df[filtered_df['Start Timestamp'] >= last_quarter])
 
-yearly_views = filtered_df.groupby(filtered_df['Start Timestamp'].dt.to_period('Y')).size().sort_index()
-monthly_views = filtered_df.groupby(filtered_df['Start Timestamp'].dt.to_period('M')).size().sort_index()
-quarterly_views = filtered_df.groupby(filtered_df['Start Timestamp'].dt.to_period('Q')).size().sort_index()
+yearly_views = weighted_size(filtered_df, filtered_df['Start Timestamp'].dt.to_period('Y')).sort_index()
+monthly_views = weighted_size(filtered_df, filtered_df['Start Timestamp'].dt.to_period('M')).sort_index()
+quarterly_views = weighted_size(filtered_df, filtered_df['Start Timestamp'].dt.to_period('Q')).sort_index()
 
 yoy_change = get_delta(yearly_views)
 mom_change = get_delta(monthly_views)
@@ -161,30 +142,32 @@ qoq_change = get_delta(quarterly_views)
 
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.markdown(f'<div class="metric-value">{total_reports:,}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{total_reports}</div>', unsafe_allow_html=True)
     st.markdown('<div class="metric-label">Reports Accessed</div>', unsafe_allow_html=True)
 with col2:
-    st.markdown(f'<div class="metric-value">{total_users:,}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{total_users}</div>', unsafe_allow_html=True)
     st.markdown('<div class="metric-label">Unique Users</div>', unsafe_allow_html=True)
 with col3:
-    st.markdown(f'<div class="metric-value">{human_format(total_views)}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{format_estimate(total_views, human_format)}</div>', unsafe_allow_html=True)
     st.markdown('<div class="metric-label">Total Views</div>', unsafe_allow_html=True)
 
 col4, col5, col6 = st.columns(3)
 with col4:
-    st.markdown(f'<div class="metric-value">{human_format(views_30)}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{format_estimate(views_30, human_format)}</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="metric-label">MoM Views ({format_change_arrow(mom_change)} )</div>', unsafe_allow_html=True)
 with col5:
-    st.markdown(f'<div class="metric-value">{human_format(views_90)}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{format_estimate(views_90, human_format)}</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="metric-label">QoQ Views ({format_change_arrow(qoq_change)} )</div>', unsafe_allow_html=True)
 with col6:
-    st.markdown(f'<div class="metric-value">{human_format(views_365)}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{format_estimate(views_365, human_format)}</div>', unsafe_allow_html=True)
     st.markdown(f'<div class="metric-label">YoY Views ({format_change_arrow(yoy_change)} )</div>', unsafe_allow_html=True)
 
 # -------------------- Trend Chart --------------------
+import plotly.express as px
+
 st.subheader("Usage Trend Over Time")
 filtered_df['Time Group'] = filtered_df['Start Timestamp'].dt.to_period('M').dt.to_timestamp()
-trend_data = filtered_df.groupby('Time Group').size().reset_index(name='Views')
+trend_data = weighted_size(filtered_df, 'Time Group').round().astype(int).reset_index(name='Views')
 
 bar_line_chart = px.bar(
     trend_data,
@@ -265,7 +248,7 @@ st.markdown("<br><br>", unsafe_allow_html=True)
 
 # -------------------- Performance Summary --------------------
 st.subheader("Performance by Subject Area")
-access_counts = filtered_df.groupby('Subject Area Name').size().reset_index(name='Total Accesses')
+access_counts = weighted_size(filtered_df, 'Subject Area Name').round().astype(int).reset_index(name='Total Accesses')
 unique_dashboards = filtered_df.groupby('Subject Area Name')['Dashboard Page'].nunique().reset_index(name='Dashboard Count')
 subject_summary = pd.merge(access_counts, unique_dashboards, on='Subject Area Name')
 subject_summary['Avg Views per Dashboard'] = (subject_summary['Total Accesses'] / subject_summary['Dashboard Count']).round(2)
@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
-import os
+from components.export import export_button, file_fingerprint
+from components.paginated_table import paginated_table
+from components.person_filter import person_filter
+from components.preview import preview_badge, preview_toggle
+from utils.datasets import dataset_path
+from utils.identity import load_identity_index
+from utils.loaders import load_error_log, load_total_records
+from utils.preview import estimate_count, format_distinct, format_estimate, scaled, weighted_size, weighted_value_counts
 
 # -------------------- Page Config & Styling --------------------
 st.set_page_config(
@@ -53,22 +59,15 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # -------------------- Load Data --------------------
-@st.cache_data
-
-def load_data():
-    dir_path = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(dir_path, "..", "datasets", "error_file_cleaned_1.csv")
-    df = pd.read_csv(file_path)
-    if 'Start Timestamp' in df.columns:
-        df['Date'] = pd.to_datetime(df['Start Timestamp'])
-    elif 'Timestamp' in df.columns:
-        df['Date'] = pd.to_datetime(df['StartTimestamp'])
-    elif 'Error Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Error Date'])
-    return df
+# The stratified sample from sample_datasets.py when preview is on
+file_path, preview = preview_toggle("error_file_cleaned_1.csv")
+# Records per month of the whole answers log, from pipelines/Answers_log_cleaning.ipynb
+counts_path = dataset_path("answers_log_monthly_counts.csv")
 
 # Load and prepare data
-df = load_data()
+df = load_error_log(file_path)
+identity = load_identity_index()
+df['person_id'] = identity.map_series('account', df['User Name'])
 
 # -------------------- Sidebar Filters --------------------
 with st.sidebar:
@@ -90,6 +89,11 @@ with st.sidebar:
 
     dashboard_filtered = subject_filtered if selected_dashboard == "All" else subject_filtered[subject_filtered["Parsed Dashboard Name"] == selected_dashboard]
 
+    # Same user selection as the journey pages, matched on person_id
+    selected_user = person_filter(df["person_id"].dropna().unique(), identity, label="User")
+    if selected_user != "All":
+        dashboard_filtered = dashboard_filtered[dashboard_filtered["person_id"] == selected_user]
+
     if "Date" in dashboard_filtered.columns:
         min_date = dashboard_filtered["Date"].min().date()
         max_date = dashboard_filtered["Date"].max().date()
@@ -105,14 +109,17 @@ st.title("Error Log Analytics Dashboard")
 # -------------------- KPI Section --------------------
 #st.subheader("Key Metrics")
 
-total_errors = len(filtered_df)
-total_records = 1436562
-error_rate = (total_errors / total_records * 100) if total_records else 0
-affected_users = filtered_df['User Name'].nunique() if 'User Name' in filtered_df.columns else "N/A"
-affected_dashboards = filtered_df['Parsed Dashboard Name'].nunique() if 'Parsed Dashboard Name' in filtered_df.columns else "Parsed Dashboard Name"
+if preview:
+    preview_badge()
+
+total_errors = estimate_count(filtered_df)
+total_records = load_total_records(counts_path)
+error_rate = scaled(total_errors, 100 / total_records) if total_records else scaled(total_errors, 0)
+affected_users = format_distinct(filtered_df['User Name'].nunique(), filtered_df) if 'User Name' in filtered_df.columns else "N/A"
+affected_dashboards = format_distinct(filtered_df['Parsed Dashboard Name'].nunique(), filtered_df) if 'Parsed Dashboard Name' in filtered_df.columns else "Parsed Dashboard Name"
 
 most_impacted_area = (
-    filtered_df['Subject Area Name'].value_counts().idxmax()
+    weighted_value_counts(filtered_df['Subject Area Name'], filtered_df).idxmax()
     if 'Subject Area Name' in filtered_df.columns and not filtered_df['Subject Area Name'].isna().all()
     else "N/A"
 )
@@ -120,10 +127,10 @@ most_impacted_area = (
 # Display metrics
 col1, col2, col3, col4 = st.columns(4)
 with col1:
-    st.markdown(f'<div class="metric-value">{total_errors:,}</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{format_estimate(total_errors)}</div>', unsafe_allow_html=True)
     st.markdown('<div class="metric-label">Total Errors Logged</div>', unsafe_allow_html=True)
 with col2:
-    st.markdown(f'<div class="metric-value">{error_rate:.2f}%</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="metric-value">{format_estimate(error_rate, "{:.2f}")}%</div>', unsafe_allow_html=True)
     st.markdown('<div class="metric-label">Error Rate</div>', unsafe_allow_html=True)
 with col3:
     st.markdown(f'<div class="metric-value">{affected_users}</div>', unsafe_allow_html=True)
@@ -135,11 +142,13 @@ with col4:
 st.markdown(f'<div class="metric-label" style="text-align:left;">Most Impacted Subject Area: <span class="metric-value" style="font-size:14px; text-align:left;">{most_impacted_area}</span></div>', unsafe_allow_html=True)
 
 # -------------------- Error Category Breakdown & Errors Over Time --------------------
+import plotly.express as px
+
 col_cat, col_trend = st.columns([1, 2])
 
 with col_cat:
     st.subheader("Errors by Category")
-    category_counts = filtered_df["Error Category"].value_counts().reset_index()
+    category_counts = weighted_value_counts(filtered_df["Error Category"], filtered_df).round().astype(int).reset_index()
     category_counts.columns = ["Error Category", "Count"]
 
     fig_category = px.bar(
@@ -176,7 +185,7 @@ with col_trend:
     st.subheader("Errors Over Time")
     if not filtered_df.empty and "Date" in filtered_df.columns:
         filtered_df["Month"] = filtered_df["Date"].dt.to_period("M")
-        monthly_counts = filtered_df.groupby(["Month", "Error Category"]).size().reset_index(name="Count")
+        monthly_counts = weighted_size(filtered_df, ["Month", "Error Category"]).round().astype(int).reset_index(name="Count")
         monthly_counts["Month"] = monthly_counts["Month"].dt.to_timestamp()
 
         # Total errors per month (for the trend line)
@@ -235,11 +244,29 @@ display_df = filtered_df[columns_to_show].rename(columns={"Error Text": "Error M
 
 search_term = st.text_input("Search errors:", "")
 if search_term:
-    search_results = display_df[display_df.astype(str).apply(lambda row: row.str.contains(search_term, case=False).any(), axis=1)]
-    st.dataframe(search_results, use_container_width=True)
+    matches = pd.Series(False, index=display_df.index)
+    for col in display_df.columns:
+        matches |= display_df[col].astype(str).str.contains(search_term, case=False, regex=False)
+    paginated_table(display_df[matches], key="error_log")
 else:
-    st.dataframe(display_df, use_container_width=True)
+    paginated_table(display_df, key="error_log")
 
 # Download button
-csv = display_df.to_csv(index=False).encode("utf-8")
-st.download_button("Download Filtered Logs", data=csv, file_name="error_logs.csv", mime="text/csv")
+export_filters = {
+    "category": selected_category,
+    "subject": selected_subject,
+    "dashboard": selected_dashboard,
+    "user": selected_user,
+    "dates": (start_date, end_date) if "Date" in dashboard_filtered.columns else None,
+}
+if preview:
+    st.caption("The log above is the preview sample; switch off preview to download the full filtered log.")
+else:
+    export_button(
+        display_df,
+        fingerprint=file_fingerprint(file_path),
+        filters=export_filters,
+        file_name="error_logs",
+        label="Download Filtered Logs",
+        key="error_export"
+    )
@@ -1,11 +1,9 @@
 # notification_dashboard.py
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
-import os
+from utils.loaders import load_notifications
 
 # Set page config
 st.set_page_config(
@@ -157,60 +155,27 @@ with st.sidebar:
     st.markdown('<div class="filter-title">Filters</div>', unsafe_allow_html=True)
 
     # Load data
-    @st.cache_data
-    def load_data():
-        try:
-            dir_path_1 = os.path.dirname(os.path.abspath(__file__))
-            file_path_1 = os.path.join(dir_path_1, "..", "datasets", "hub_notifications_transformed.csv")
-            df1 = pd.read_csv(file_path_1)
-
-            dir_path_2 = os.path.dirname(os.path.abspath(__file__))
-            file_path_2 = os.path.join(dir_path_2, "..", "datasets", "notifications_with_tiles.csv")
-            df2 = pd.read_csv(file_path_2)
-
-            
-
-            # Convert date columns to datetime
-            df1['start'] = pd.to_datetime(df1['start'], errors='coerce')
-            df1['end'] = pd.to_datetime(df1['end'], errors='coerce')
-            df2['start'] = pd.to_datetime(df2['start'], errors='coerce')
-            df2['end'] = pd.to_datetime(df2['end'], errors='coerce')
-
-            # Extract month and year for both dataframes
-            df1['month_year'] = df1['start'].dt.strftime('%b %Y')
-            df2['month_year'] = df2['start'].dt.strftime('%b %Y')
-
-            # Create a mapping from tile_id to tile_name using df2
-            tile_mapping = df2[['tile_id', 'tile_name']].drop_duplicates()
-            tile_id_to_name = dict(zip(tile_mapping['tile_id'].astype(str), tile_mapping['tile_name']))
-
-            # Map df1's tile (which contains tile_id) to tile_name using the mapping
-            df1['tile_name'] = df1['tile'].astype(str).map(tile_id_to_name)
-
-            return df1, df2
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-            # Create sample data for demonstration
-            df1 = pd.DataFrame({
-                'notification_type': ['major', 'major', 'major', 'minor', 'minor'],
-                'time_diff_days': [7.0, 7.0, 7.7, 0.1, 0.2],
-                'start': pd.date_range(start='2023-06-01', periods=5, freq='D'),
-                'tile': ['1', '2', '1', '3', '2']
-            })
-            df1['month_year'] = df1['start'].dt.strftime('%b %Y')
-
-            df2 = pd.DataFrame({
-                'notification_type': ['minor', 'minor', 'minor', 'minor', 'minor'],
-                'time_diff_days': [0.1, 0.1, 0.2, 0.3, 0.1],
-                'start': pd.date_range(start='2023-07-01', periods=5, freq='15D'),
-                'tile_id': ['1', '2', '3', '1', '2'],
-                'tile_name': ['Dashboard A', 'Dashboard B', 'Dashboard C', 'Dashboard A', 'Dashboard B']
-            })
-            df2['month_year'] = df2['start'].dt.strftime('%b %Y')
-
-            return df1, df2
-
-    df1, df2 = load_data()
+    try:
+        df1, df2 = load_notifications()
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        # Create sample data for demonstration
+        df1 = pd.DataFrame({
+            'notification_type': ['major', 'major', 'major', 'minor', 'minor'],
+            'time_diff_days': [7.0, 7.0, 7.7, 0.1, 0.2],
+            'start': pd.date_range(start='2023-06-01', periods=5, freq='D'),
+            'tile': ['1', '2', '1', '3', '2']
+        })
+        df1['month_year'] = df1['start'].dt.strftime('%b %Y')
+
+        df2 = pd.DataFrame({
+            'notification_type': ['minor', 'minor', 'minor', 'minor', 'minor'],
+            'time_diff_days': [0.1, 0.1, 0.2, 0.3, 0.1],
+            'start': pd.date_range(start='2023-07-01', periods=5, freq='15D'),
+            'tile_id': ['1', '2', '3', '1', '2'],
+            'tile_name': ['Dashboard A', 'Dashboard B', 'Dashboard C', 'Dashboard A', 'Dashboard B']
+        })
+        df2['month_year'] = df2['start'].dt.strftime('%b %Y')
 
     # Get unique notification types
     notification_types = sorted(list(set(df1['notification_type'].unique()) | set(df2['notification_type'].unique())))
@@ -310,6 +275,8 @@ with kpi_col3:
     st.markdown('<div class="kpi-label">Avg. Duration Minor (Days)</div>', unsafe_allow_html=True)
 
 # Charts with 40:60 split
+import plotly.express as px
+
 chart_col1, chart_col2 = st.columns([4, 6])
 
 with chart_col1:
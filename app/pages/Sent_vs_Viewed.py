@@ -1,9 +1,12 @@
 # Sent_vs_Viewed.py
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
-import os
+from components.paginated_table import paginated_table
+from utils.loaders import load_sent_viewed_counters
+from utils.role_fanout import expand_recipients, load_role_fanout, role_person_ids
+
+ALL_ROLES = "All"
 
 # Set page config
 st.set_page_config(
@@ -48,38 +51,28 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Load data
-@st.cache_data
 def load_data():
     try:
-        dir_path_1 = os.path.dirname(os.path.abspath(__file__))
-        file_path_1 = os.path.join(dir_path_1, "..", "datasets", "notifications_users.csv")
-        df_sent = pd.read_csv(file_path_1, parse_dates=['start'])
-
-        dir_path_2 = os.path.dirname(os.path.abspath(__file__))
-        file_path_2 = os.path.join(dir_path_2, "..", "datasets", "Combined_views.csv")
-        df_viewed = pd.read_csv(file_path_2, parse_dates=['View_time'] )
-
-        return df_sent, df_viewed
+        return load_sent_viewed_counters()
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return None, None
+        return None
 
-df_sent, df_viewed = load_data()
+df_counters = load_data()
 
-if df_sent is not None and df_viewed is not None:
+if df_counters is not None:
     # Sidebar filters
     with st.sidebar:
         st.markdown('<div class="filter-title">Filters</div>', unsafe_allow_html=True)
 
         # Role filter
-        role_titles = df_sent['tile_roles'].dropna().unique()
+        role_titles = df_counters.loc[(df_counters['role'] != ALL_ROLES) & (df_counters['sent'] > 0), 'role'].unique()
         role_options = ["All"] + sorted(role_titles)
         selected_role = st.selectbox("Role Title", role_options)
 
         # Year filter
-        sent_years = df_sent['start'].dt.year.dropna().unique()
-        viewed_years = df_viewed['View_time'].dt.year.dropna().unique()
-        all_years = sorted(set(sent_years) | set(viewed_years))
+        all_counters = df_counters[df_counters['role'] == ALL_ROLES]
+        all_years = sorted(all_counters.loc[(all_counters['sent'] > 0) | (all_counters['viewed'] > 0), 'year'].unique())
         year_options = ["All"] + [str(y) for y in all_years]
         selected_year = st.selectbox("Year", year_options)
 
@@ -88,33 +81,22 @@ if df_sent is not None and df_viewed is not None:
     # Main content
     st.title("Sent vs Viewed Analytics")
 
-    # Apply filters
-    if selected_role != "All":
-        filtered_users = df_sent[df_sent['tile_roles'] == selected_role]['capstone_email'].unique()
-        df_sent_filtered = df_sent[df_sent['capstone_email'].isin(filtered_users)].copy()
-        df_viewed_filtered = df_viewed[df_viewed['email'].isin(filtered_users)].copy()
-    else:
-        df_sent_filtered = df_sent.copy()
-        df_viewed_filtered = df_viewed.copy()
+    # Apply filters: a lookup of the role's monthly counters
+    df_filtered = df_counters[df_counters['role'] == (ALL_ROLES if selected_role == "All" else selected_role)]
 
     if selected_year != "All":
         selected_year = int(selected_year)
-        df_sent_filtered = df_sent_filtered[df_sent_filtered['start'].dt.year == selected_year]
-        df_viewed_filtered = df_viewed_filtered[df_viewed_filtered['View_time'].dt.year == selected_year]
-
-    # Add Month columns
-    df_sent_filtered['Month'] = df_sent_filtered['start'].dt.to_period("M")
-    df_viewed_filtered['Month'] = df_viewed_filtered['View_time'].dt.to_period("M")
+        df_filtered = df_filtered[df_filtered['year'] == selected_year]
 
     # Apply exclusions
     exclude_sent_months = [pd.Period("2023-12", freq="M"), pd.Period("2025-01", freq="M")]
-    df_sent_filtered = df_sent_filtered[~df_sent_filtered['Month'].isin(exclude_sent_months)]
-    df_viewed_filtered = df_viewed_filtered[df_viewed_filtered['View_time'].dt.year != 2025]
+    df_sent_filtered = df_filtered[~df_filtered['Month'].isin(exclude_sent_months) & (df_filtered['sent'] > 0)]
+    df_viewed_filtered = df_filtered[(df_filtered['year'] != 2025) & (df_filtered['viewed'] > 0)]
     df_viewed_chart = df_viewed_filtered[df_viewed_filtered['Month'] != pd.Period("2023-12", freq="M")]
 
     # Calculate metrics
-    total_sent = len(df_sent_filtered)
-    total_viewed = df_viewed_filtered['count'].sum()
+    total_sent = int(df_sent_filtered['sent'].sum())
+    total_viewed = int(df_viewed_filtered['viewed'].sum())
 
     # Display metrics
     metric_col1, metric_col2 = st.columns(2)
@@ -128,10 +110,12 @@ if df_sent is not None and df_viewed is not None:
         st.markdown('<div class="metric-label">Total Notifications Viewed</div>', unsafe_allow_html=True)
 
     # Prepare chart data
-    monthly_sent = df_sent_filtered['Month'].value_counts().sort_index()
-    monthly_viewed = df_viewed_chart.groupby('Month')['count'].sum().sort_index()
+    monthly_sent = df_sent_filtered.set_index('Month')['sent'].sort_index()
+    monthly_viewed = df_viewed_chart.set_index('Month')['viewed'].sort_index()
 
     # Create chart
+    import plotly.graph_objects as go
+
     fig = go.Figure()
 
     # Add traces
@@ -206,5 +190,15 @@ if df_sent is not None and df_viewed is not None:
 
     st.plotly_chart(fig, use_container_width=True)
 
+    # Per-user rows are only built on request
+    with st.expander("Recipients"):
+        if st.checkbox("Expand notifications to individual recipients"):
+            df_sent, df_members = load_role_fanout()
+            df_sent = df_sent[df_sent['start'].dt.to_period("M").isin(df_sent_filtered['Month'])]
+            recipients = expand_recipients(df_sent, df_members)
+            if selected_role != "All":
+                recipients = recipients[recipients['person_id'].isin(role_person_ids(df_members, selected_role))]
+            paginated_table(recipients, key="recipients")
+
 else:
     st.error("Unable to load data. Please check the data files and try again.")
\ No newline at end of file
@@ -1,7 +1,11 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-import os
+from components.export import export_button, file_fingerprint
+from components.journey_renderer import render_journey_groups
+from components.person_filter import person_filter
+from utils.datasets import dataset_path
+from utils.identity import load_identity_index
+from utils.loaders import load_labelled_journeys
+from utils.recommendations import index_available, load_next_dashboard_index
 
 # -------------------- Page Setup --------------------
 st.set_page_config(page_title="User Journey", layout="wide")
@@ -26,32 +30,24 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # -------------------- Load Data --------------------
-@st.cache_data
-def load_data():
-    dir_path = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(dir_path, "..", "datasets", "user_level_with_names.csv")
-    df = pd.read_csv(file_path)
-    return df
+file_path = dataset_path("user_level_with_names.csv")
 
-df = load_data()
-
-# -------------------- Preprocessing --------------------
-for step in ['Step 1', 'Step 2', 'Step 3']:
-    df[step + '_Clean'] = df[step].apply(lambda x: os.path.basename(str(x)) if pd.notnull(x) else "")
-
-df['Parent Path'] = df['Step 1'].apply(lambda x: str(x).split('/')[2] if pd.notnull(x) and len(str(x).split('/')) > 2 else 'Other')
+# person_id, step names and Parent Path are added once per dataset and cached
+df = load_labelled_journeys(file_path)
+identity = load_identity_index()
 
 # -------------------- Always Available Download Button --------------------
 st.markdown("### Download Full User Journey Data")
 st.info("This download includes **all user journeys**, regardless of filters above.")
 
-csv_data = df.to_csv(index=False).encode("utf-8")
-
-st.download_button(
-    label="📥 Download Full Dataset (CSV)",
-    data=csv_data,
-    file_name="full_user_journey.csv",
-    mime="text/csv"
+# The file is only built when requested, and reused until the dataset changes
+export_button(
+    df,
+    fingerprint=file_fingerprint(file_path),
+    filters={},
+    file_name="full_user_journey",
+    label="📥 Download Full Dataset",
+    key="journey_export"
 )
 
 # -------------------- Sidebar Filters --------------------
@@ -69,8 +65,7 @@ selected_week = st.sidebar.selectbox("Select Week", all_weeks)
 all_bins = ['All'] + sorted(df['Bin Category'].dropna().unique().tolist())
 selected_bin = st.sidebar.selectbox("Select Bin", all_bins)
 
-all_users = ['All'] + sorted(df['capstone_name'].dropna().unique().tolist())
-selected_user = st.sidebar.selectbox("Select User Name", all_users)
+selected_user = person_filter(df['person_id'].dropna().unique(), identity)
 
 parent_paths = ['All'] + sorted(df['Parent Path'].dropna().unique().tolist())
 selected_parent = st.sidebar.selectbox("Select Parent Path", parent_paths)
@@ -86,27 +81,78 @@ if selected_week != 'All':
 if selected_bin != 'All':
     filtered_df = filtered_df[filtered_df['Bin Category'] == selected_bin]
 if selected_user != 'All':
-    filtered_df = filtered_df[filtered_df['capstone_name'] == selected_user]
+    filtered_df = filtered_df[filtered_df['person_id'] == selected_user]
 else:
     max_users = 5
-    top_users = filtered_df['capstone_name'].value_counts().head(max_users).index.tolist()
-    filtered_df = filtered_df[filtered_df['capstone_name'].isin(top_users)]
+    top_users = filtered_df['person_id'].value_counts().head(max_users).index.tolist()
+    filtered_df = filtered_df[filtered_df['person_id'].isin(top_users)]
     st.info(f"Showing user journey for top {max_users} most active users.")
 
 if selected_parent != 'All':
     filtered_df = filtered_df[filtered_df['Parent Path'] == selected_parent]
 
+# -------------------- Next-Dashboard Recommendations --------------------
+st.markdown("### What Do Users Open Next?")
+
+if index_available():
+    next_index = load_next_dashboard_index()
+
+    # Narrowest scope the sidebar selects: title first, then bin, else everyone
+    if selected_title != 'All':
+        scope, scope_value = 'title', selected_title
+    elif selected_bin != 'All':
+        scope, scope_value = 'bin', selected_bin
+    else:
+        scope, scope_value = 'all', 'All'
+
+    rec_col1, rec_col2, rec_col3 = st.columns([3, 3, 1])
+    with rec_col1:
+        current_dashboard = st.selectbox(
+            "Current dashboard",
+            next_index.dashboards(scope, scope_value),
+            format_func=lambda x: x.split('/')[-1]
+        )
+    with rec_col2:
+        previous_dashboard = st.selectbox(
+            "Previous dashboard (optional)",
+            ['None'] + next_index.previous_dashboards(current_dashboard, scope, scope_value),
+            format_func=lambda x: x.split('/')[-1]
+        )
+    with rec_col3:
+        top_k = st.number_input("Top", min_value=1, max_value=20, value=5)
+
+    if current_dashboard is not None:
+        recommendations = next_index.top_next(
+            current_dashboard,
+            previous=None if previous_dashboard == 'None' else previous_dashboard,
+            k=top_k,
+            scope=scope,
+            scope_value=scope_value
+        )
+        if recommendations.empty:
+            st.info("No recorded next steps for this dashboard in the current selection.")
+        else:
+            recommendations.insert(0, 'Next Dashboard', recommendations['next'].str.split('/').str[-1])
+            recommendations['Share'] = (recommendations['probability'] * 100).round(1).astype(str) + '%'
+            st.dataframe(
+                recommendations.rename(columns={'count': 'Count', 'next': 'Full Path'})[['Next Dashboard', 'Count', 'Share', 'Full Path']],
+                use_container_width=True,
+                hide_index=True
+            )
+else:
+    st.info("Recommendation index not found. Run pipelines/Journey_recommendation_index.ipynb to build it.")
+
 # -------------------- Conditional Rendering --------------------
 if selected_title == 'All' or selected_quarter == 'All':
     st.warning("Please select a **Title** and **Quarter** to view the user journey.")
     st.stop()
 
 # -------------------- Display KPI --------------------
-unique_users = filtered_df['capstone_name'].nunique()
+unique_users = filtered_df['person_id'].nunique()
 unique_dashboards = filtered_df[['Step 1', 'Step 2', 'Step 3']].nunique().sum()
 total_transitions = len(filtered_df)
 most_common_dashboard = filtered_df['Step 1'].mode().iloc[0].split('/')[-1] if not filtered_df.empty else "N/A"
-most_active_user = filtered_df['capstone_name'].value_counts().idxmax() if not filtered_df.empty else "N/A"
+most_active_user = identity.display_name(filtered_df['person_id'].value_counts().idxmax()) if not filtered_df.empty else "N/A"
 avg_transitions = round(total_transitions / unique_users, 2) if unique_users > 0 else 0
 
 col1, col2, col3 = st.columns(3)
@@ -133,7 +179,6 @@ with col6:
     st.markdown(f"<div class='kpi-value'>{avg_transitions}</div>", unsafe_allow_html=True)
     st.markdown(f"<div class='kpi-label'>Avg/User</div>", unsafe_allow_html=True)
 
-# -------------------- Journey Visualization --------------------
 # -------------------- Journey Visualization --------------------
 st.markdown("### Step-wise Journey Visualization")
 
@@ -146,54 +191,4 @@ color_map = {
 }
 default_color = '#dbeafe'
 
-grouped = filtered_df.groupby(['capstone_name', 'Week Number'])
-
-for (user, week), group in grouped:
-    st.markdown(f"**{user} | Week: {week}**")
-    for _, row in group.iterrows():
-        steps = [row['Step 1_Clean'], row['Step 2_Clean'], row['Step 3_Clean']]
-        fig = go.Figure()
-        x_pos = [0, 1.5, 3]  # Spread out for longer boxes
-
-        for i, step in enumerate(steps):
-            pastel_color = color_map.get(step, default_color)
-            fig.add_shape(
-                type="rect",
-                x0=x_pos[i] - 0.5, y0=-0.2,
-                x1=x_pos[i] + 0.5, y1=0.2,
-                line=dict(color="rgba(0,0,0,0.1)", width=1),
-                fillcolor=pastel_color,
-                opacity=0.8,
-                layer="below"
-            )
-            fig.add_trace(go.Scatter(
-                x=[x_pos[i]], y=[0],
-                mode="text",
-                text=[step],
-                textfont=dict(size=16, color="#333"),
-                hoverinfo="text",
-                showlegend=False
-            ))
-
-        for i in range(len(steps) - 1):
-            fig.add_annotation(
-                x=x_pos[i + 1] - 0.7, y=0,
-                ax=x_pos[i] + 0.5, ay=0,
-                xref="x", yref="y", axref="x", ayref="y",
-                showarrow=True,
-                arrowhead=2,
-                arrowsize=0.7,
-                arrowwidth=1.5,
-                arrowcolor="gray"
-            )
-
-        fig.update_layout(
-            height=150,
-            margin=dict(l=10, r=10, t=10, b=10),
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False),
-            plot_bgcolor="white",
-            hovermode="closest",
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    st.markdown("---")
+render_journey_groups(filtered_df, color_map, default_color, key="journey")
@@ -1,7 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import os
+from components.flow_sankey import sankey_figure
+from components.person_filter import person_filter
+from components.preview import preview_badge, preview_toggle
+from utils.identity import load_identity_index
+from utils.loaders import load_journeys
+from utils.preview import WEIGHT_COLUMN, estimate_count, format_distinct, format_estimate, weighted_mode, weighted_size, weighted_value_counts
+from utils.path_trie import ROOT_ID, load_path_trie, trie_available
+from utils.transition_matrices import (
+    flows_from_rows, load_filtered_flows, load_transition_matrices, matrices_available, prune_flows
+)
 
 # -------------------- Page Setup --------------------
 st.set_page_config(page_title="Overview Chart", layout="wide")
@@ -31,9 +38,13 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # -------------------- Load Data --------------------
-dir_path = os.path.dirname(os.path.abspath(__file__))
-file_path = os.path.join(dir_path, "..", "datasets", "user_level_with_names.csv")
-df = pd.read_csv(file_path)
+# The stratified sample from sample_datasets.py when preview is on
+file_path, preview = preview_toggle("user_level_with_names.csv")
+df = load_journeys(file_path)
+
+# Users are filtered on the resolved person_id; capstone_name is not unique
+identity = load_identity_index()
+df['person_id'] = identity.map_series('account', df['User Name'])
 
 # -------------------- Sidebar Filters --------------------
 st.sidebar.markdown('<div class="filter-title">Filters</div>', unsafe_allow_html=True)
@@ -50,15 +61,14 @@ selected_week = st.sidebar.selectbox("Select Week", all_weeks)
 all_bins = ['All'] + sorted(df['Bin Category'].dropna().unique().tolist())
 selected_bin = st.sidebar.selectbox("Select Bin", all_bins)
 
-all_users = ['All'] + sorted(df['capstone_name'].dropna().unique().tolist())
-selected_user = st.sidebar.selectbox("Select User Name", all_users)
+selected_user = person_filter(df['person_id'].dropna().unique(), identity)
 
 # -------------------- Apply Filters --------------------
 filtered_df = df.copy()
 if selected_title != 'All':
     filtered_df = filtered_df[filtered_df['title'] == selected_title]
 if selected_user != 'All':
-    filtered_df = filtered_df[filtered_df['capstone_name'] == selected_user]
+    filtered_df = filtered_df[filtered_df['person_id'] == selected_user]
 if selected_bin != 'All':
     filtered_df = filtered_df[filtered_df['Bin Category'] == selected_bin]
 if selected_quarter != 'All':
@@ -67,24 +77,29 @@ if selected_week != 'All':
     filtered_df = filtered_df[filtered_df['Week Number'] == selected_week]
 
 # -------------------- KPI Calculation --------------------
-unique_users = filtered_df['capstone_name'].nunique()
+unique_users = filtered_df['person_id'].nunique()
 unique_dashboards = filtered_df[['Step 1', 'Step 2', 'Step 3']].nunique().sum()
-total_transitions = len(filtered_df)
-most_common_dashboard = filtered_df['Step 1'].mode().iloc[0].split('/')[-1] if not filtered_df.empty else "N/A"
-most_active_user = filtered_df['capstone_name'].value_counts().idxmax() if not filtered_df.empty else "N/A"
-avg_transitions = round(total_transitions / unique_users, 2) if unique_users > 0 else 0
+total_transitions = estimate_count(filtered_df)
+most_common_dashboard = weighted_mode(filtered_df['Step 1'], filtered_df).split('/')[-1] if not filtered_df.empty else "N/A"
+most_active_user = identity.display_name(weighted_value_counts(filtered_df['person_id'], filtered_df).idxmax()) if not filtered_df.empty else "N/A"
+avg_transitions = round(total_transitions.value / unique_users, 2) if unique_users > 0 else 0
+# Users seen in a sample undercount the real users, so the sampled average is an upper bound
+avg_transitions_label = f"≤{avg_transitions}" if preview else avg_transitions
+
+if preview:
+    preview_badge()
 
 # -------------------- KPI Display (3 per row, 2 rows) --------------------
 # Row 1
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.markdown(f"<div class='kpi-value'>{unique_users}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi-value'>{format_distinct(unique_users, filtered_df)}</div>", unsafe_allow_html=True)
     st.markdown(f"<div class='kpi-label'>Unique Users</div>", unsafe_allow_html=True)
 with col2:
-    st.markdown(f"<div class='kpi-value'>{unique_dashboards}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi-value'>{format_distinct(unique_dashboards, filtered_df)}</div>", unsafe_allow_html=True)
     st.markdown(f"<div class='kpi-label'>Dashboards</div>", unsafe_allow_html=True)
 with col3:
-    st.markdown(f"<div class='kpi-value'>{total_transitions}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi-value'>{format_estimate(total_transitions)}</div>", unsafe_allow_html=True)
     st.markdown(f"<div class='kpi-label'>Transitions</div>", unsafe_allow_html=True)
 
 # Spacer
@@ -99,10 +114,12 @@ with col5:
     st.markdown(f"<div class='kpi-value'>{most_active_user}</div>", unsafe_allow_html=True)
     st.markdown(f"<div class='kpi-label'>Most Active User</div>", unsafe_allow_html=True)
 with col6:
-    st.markdown(f"<div class='kpi-value'>{avg_transitions}</div>", unsafe_allow_html=True)
+    st.markdown(f"<div class='kpi-value'>{avg_transitions_label}</div>", unsafe_allow_html=True)
     st.markdown(f"<div class='kpi-label'>Avg/User</div>", unsafe_allow_html=True)
 
 # -------------------- Top Dashboards Chart & Bin Chart Side-by-Side --------------------
+import plotly.express as px
+
 
 #st.markdown("## Dashboard Usage Insights")
 
@@ -128,9 +145,12 @@ with col1:
         </div>
         """, unsafe_allow_html=True)
 
-    step_counts = filtered_df['Step 1'].value_counts().head(10).reset_index()
+    step_counts = weighted_value_counts(filtered_df['Step 1'], filtered_df).round().astype(int).head(10).reset_index()
     step_counts.columns = ['Full Path', 'Count']
-    step_counts['Dashboard Label'] = step_counts['Full Path'].apply(lambda x: x.split('/')[-1])
+    if trie_available():
+        step_counts['Dashboard Label'] = load_path_trie().names(step_counts['Full Path'])
+    else:
+        step_counts['Dashboard Label'] = step_counts['Full Path'].apply(lambda x: x.split('/')[-1])
     step_counts = step_counts[::-1].reset_index(drop=True)  # Reverse so biggest is on top
 
     fig_dash = px.bar(
@@ -185,7 +205,7 @@ with col2:
         </div>
         """, unsafe_allow_html=True)
 
-    bin_counts = filtered_df.groupby(['Bin Category']).size().reset_index(name='Count')
+    bin_counts = weighted_size(filtered_df, ['Bin Category']).round().astype(int).reset_index(name='Count')
     bin_counts['Percentage'] = (bin_counts['Count'] / bin_counts['Count'].sum() * 100).round(2)
     bin_counts['Label'] = bin_counts.apply(lambda row: f"{row['Count']} ({row['Percentage']}%)", axis=1)
     bin_counts = bin_counts.sort_values(by="Count", ascending=False)
@@ -230,6 +250,105 @@ with col2:
 
     st.plotly_chart(fig_bin, use_container_width=True)
 
+# -------------------- Dashboard Flow (Sankey) --------------------
+st.markdown("""
+<div style="font-size:14px; margin:1rem 0 0.4rem 0;">
+    <strong>Dashboard Flow: Step 1 → Step 2 → Step 3</strong>
+</div>
+""", unsafe_allow_html=True)
+
+flow_col1, flow_col2 = st.columns(2)
+with flow_col1:
+    min_flow = st.number_input("Minimum flow count", min_value=1, value=5, step=1)
+with flow_col2:
+    max_edges = st.slider("Maximum number of flows", min_value=10, max_value=200, value=60, step=10)
+
+if matrices_available():
+    paths_df = load_transition_matrices()[0]
+    if selected_user != 'All':
+        # The precomputed matrices are keyed by quarter/week/title/bin, not by user
+        journey_rows = filtered_df
+        if preview:
+            journey_rows = filtered_df.assign(Count=(filtered_df['Count'] * filtered_df[WEIGHT_COLUMN]).round())
+        flows = flows_from_rows(journey_rows, paths_df)
+    else:
+        flows = load_filtered_flows({
+            'title': selected_title,
+            'Quarter-Year': selected_quarter,
+            'Week Number': selected_week,
+            'Bin Category': selected_bin,
+        })
+    flows = prune_flows(flows, min_count=min_flow, max_edges=max_edges)
+
+    if flows.empty:
+        st.info("No flows above the selected threshold.")
+    else:
+        st.plotly_chart(sankey_figure(flows, paths_df), use_container_width=True)
+else:
+    st.info("Transition matrices not found. Run pipelines/Journey_transition_matrices.ipynb to build them.")
+
+# -------------------- Folder Drill-down --------------------
+st.markdown("""
+<div style="font-size:14px; margin:1rem 0 0.4rem 0;">
+    <strong>Folder Drill-down</strong>
+</div>
+""", unsafe_allow_html=True)
+
+if trie_available():
+    path_trie = load_path_trie()
+    source_labels = {'Journey steps': 'journey', 'Errors': 'error'}
+    source = source_labels[st.radio("Count", list(source_labels), horizontal=True, key="trie_source")]
+
+    # One selectbox per folder level, starting below the root
+    node_id = ROOT_ID
+    level_cols = st.columns(4)
+    level = 0
+    while True:
+        children = path_trie.children_totals(node_id, source)
+        if children.empty:
+            break
+        with level_cols[level % len(level_cols)]:
+            choice = st.selectbox(
+                f"Level {level + 1}",
+                ['All'] + children['name'].tolist(),
+                key=f"trie_level_{level}"
+            )
+        if choice == 'All':
+            break
+        node_id = int(children.loc[children['name'] == choice, 'node_id'].iloc[0])
+        level += 1
+
+    node_count, node_users = path_trie.totals(node_id, source)
+    kpi1, kpi2 = st.columns(2)
+    kpi1.markdown(f'<div class="kpi-value">{node_count:,}</div><div class="kpi-label">{"Journey Steps" if source == "journey" else "Errors"}</div>', unsafe_allow_html=True)
+    kpi2.markdown(f'<div class="kpi-value">{node_users:,}</div><div class="kpi-label">Unique Users</div>', unsafe_allow_html=True)
+    st.caption(f"{path_trie.path[node_id] or '/'} · totals cover all data and ignore the sidebar filters.")
+
+    children = path_trie.children_totals(node_id, source)
+    if not children.empty:
+        children = children.sort_values(f'{source}_count', ascending=False).head(15)[::-1]
+        fig_tree = px.bar(
+            children,
+            x=f'{source}_count',
+            y='name',
+            orientation='h',
+            hover_data={'path': True, f'{source}_users': True},
+            text=f'{source}_count',
+            color_discrete_sequence=['#1a365d']
+        )
+        fig_tree.update_traces(textposition='outside', textfont_size=10, cliponaxis=False)
+        fig_tree.update_layout(
+            height=max(250, 28 * len(children)),
+            margin=dict(l=40, r=10, t=20, b=20),
+            showlegend=False,
+            font=dict(color='black', size=10),
+            xaxis=dict(title="", tickfont=dict(color='black')),
+            yaxis=dict(title="", tickfont=dict(color='black'), automargin=True)
+        )
+        st.plotly_chart(fig_tree, use_container_width=True)
+else:
+    st.info("Path index not found. Run pipelines/Path_trie_index.ipynb to build it.")
+
 # -------------------- Final Spacer --------------------
 st.markdown("<br><br><br><br>", unsafe_allow_html=True)
 
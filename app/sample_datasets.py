@@ -0,0 +1,88 @@
+"""Stratified preview samples of the large datasets in app/datasets.
+
+Pages can render from a sample first and switch to the full data on request. Each sample is
+drawn per stratum of subject area, month and user bin, using whichever of the three the dataset
+has. Users get their bin from their latest quarter in user_level_with_names. The sample is
+written beside the full data as <name>.sample.parquet and never replaces it. utils/preview.py
+turns sample rows back into full-data estimates with confidence intervals.
+
+    python app/sample_datasets.py                      draw every sample
+    python app/sample_datasets.py --fraction 0.02      smaller samples
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from utils.datasets import dataset_path, read_dataset, sample_path
+from utils.preview import stratified_sample
+
+# Strata columns of each sampled dataset: subject area, the timestamp whose month is a
+# stratum, and either a bin column or the user column to look the bin up by
+SAMPLED_DATASETS = {
+    "error_file_cleaned_1.csv": {"subject": "Subject Area Name", "timestamp": "Start Timestamp", "user": "User Name"},
+    "answers_log_cleaned_1.csv": {"subject": "Subject Area Name", "timestamp": "Start Timestamp", "user": "User Name"},
+    "user_level_with_names.csv": {"timestamp": "Week Start Date", "bin": "Bin Category"},
+}
+
+BINS_DATASET = "user_level_with_names.csv"
+
+FRACTION = 0.05
+MIN_ROWS = 30
+
+
+def load_user_bins():
+    """Bin Category of each user in their latest quarter."""
+    users = read_dataset(dataset_path(BINS_DATASET), usecols=["User Name", "Quarter-Year", "Bin Category"])
+    latest = users.sort_values("Quarter-Year").drop_duplicates("User Name", keep="last")
+    return latest.set_index("User Name")["Bin Category"]
+
+
+def strata_frame(df, spec, user_bins):
+    """The strata columns of df: subject area, month and user bin."""
+    strata = pd.DataFrame(index=df.index)
+    if "subject" in spec:
+        strata["subject"] = df[spec["subject"]]
+    strata["month"] = pd.to_datetime(df[spec["timestamp"]], errors="coerce").dt.strftime("%Y-%m")
+    if "bin" in spec:
+        strata["bin"] = df[spec["bin"]]
+    elif user_bins is not None:
+        strata["bin"] = df[spec["user"]].map(user_bins)
+    return strata
+
+
+def write_sample(name, spec, user_bins, fraction, min_rows):
+    start = time.perf_counter()
+    df = read_dataset(dataset_path(name))
+    strata = strata_frame(df, spec, user_bins)
+    sample = stratified_sample(
+        pd.concat([df, strata.add_prefix("_by_")], axis=1), list("_by_" + strata.columns), fraction, min_rows
+    )
+    sample = sample.drop(columns=list("_by_" + strata.columns))
+    sample.to_parquet(sample_path(name), index=False, compression="zstd")
+    print(
+        f"{name}: {len(sample):,} of {len(df):,} rows ({len(sample) / len(df):.1%}) in "
+        f"{sample['_stratum'].nunique():,} strata of {', '.join(strata.columns)}, "
+        f"{time.perf_counter() - start:.1f}s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fraction", type=float, default=FRACTION, help="share of each stratum to keep")
+    parser.add_argument("--min-rows", type=int, default=MIN_ROWS, help="rows kept at least per stratum")
+    args = parser.parse_args()
+
+    user_bins = load_user_bins() if os.path.exists(dataset_path(BINS_DATASET)) else None
+    for name, spec in SAMPLED_DATASETS.items():
+        if not os.path.exists(dataset_path(name)):
+            print(f"{name}: not found, skipped")
+            continue
+        write_sample(name, spec, user_bins, args.fraction, args.min_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# datasets.py
+# Files in app/datasets are read through here. compact_datasets.py replaces CSVs by
+# dictionary-encoded, zstd-compressed Parquet files holding exactly the frame the CSV parsed
+# to, so readers ask for the CSV name and get whichever of the two is on disk.
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+DATASETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "datasets")
+
+# Files a page loads side by side
+LOAD_WORKERS = 4
+
+# Columns a CSV must be parsed with a fixed type to keep its values (ids and emails that
+# could read as numbers). The compaction tool parses with the same types.
+CSV_DTYPES = {
+    "identity_aliases.csv": {"alias": str},
+    "identity_people.csv": {"account": str, "email": str},
+}
+
+
+def compacted_path(csv_path):
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def dataset_path(name):
+    """Path of dataset `name` (its CSV file name): the compacted Parquet file, unless a pipeline
+    has exported a newer CSV since it was compacted."""
+    path = os.path.join(DATASETS_DIR, name)
+    compacted = compacted_path(path)
+    if not path.endswith(".csv") or not os.path.exists(compacted):
+        return path
+    if os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(compacted):
+        return path
+    return compacted
+
+
+def sample_path(name):
+    """Stratified sample of dataset `name` written by sample_datasets.py, kept beside the full data."""
+    return os.path.join(DATASETS_DIR, os.path.splitext(name)[0] + ".sample.parquet")
+
+
+def sample_available(name):
+    """A sample exists and is not older than the full data it was drawn from."""
+    path = sample_path(name)
+    full_path = dataset_path(name)
+    if not os.path.exists(path) or not os.path.exists(full_path):
+        return False
+    return os.path.getmtime(path) >= os.path.getmtime(full_path)
+
+
+def read_dataset(path, usecols=None, parse_dates=None):
+    """DataFrame of a dataset file returned by dataset_path, CSV or Parquet alike."""
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path, columns=usecols)
+        for column in parse_dates or []:
+            df[column] = pd.to_datetime(df[column])
+        return df
+    return pd.read_csv(path, dtype=CSV_DTYPES.get(os.path.basename(path)), usecols=usecols, parse_dates=parse_dates)
+
+
+def load_concurrently(*loaders):
+    """Call each loader on a thread pool and return the results in order. pandas' C parser
+    tokenizes CSVs and pyarrow reads Parquet outside the GIL, so the files of a page load side by
+    side and a cold load waits about as long as the slowest file."""
+    if len(loaders) < 2:
+        return [loader() for loader in loaders]
+    with ThreadPoolExecutor(max_workers=min(LOAD_WORKERS, len(loaders))) as pool:
+        futures = [pool.submit(loader) for loader in loaders]
+        return [future.result() for future in futures]
+
+
+def read_datasets(*paths):
+    """read_dataset of several files at once."""
+    return load_concurrently(*[lambda path=path: read_dataset(path) for path in paths])
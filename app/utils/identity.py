@@ -0,0 +1,61 @@
+# identity.py
+# One integer person_id per person across Oracle, Tableau, the Hub and AD, resolved by
+# pipelines/Identity_resolution.ipynb. Lookups are dict hits on (alias_type, alias); pages
+# map their user columns to person_id once and filter and join on the integer.
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import dataset_path, read_dataset
+
+ALIASES_FILE = dataset_path("identity_aliases.csv")
+PEOPLE_FILE = dataset_path("identity_people.csv")
+
+ALIAS_TYPES = ['account', 'email', 'employee_id', 'name']
+
+
+def normalize_alias(values):
+    """Same normalization the pipeline applies: stripped and lowercased strings."""
+    return values.astype('string').str.strip().str.lower()
+
+
+class IdentityIndex:
+    def __init__(self, aliases_df, people_df):
+        self._lookup = {
+            alias_type: dict(zip(group['alias'], group['person_id']))
+            for alias_type, group in aliases_df.groupby('alias_type')
+        }
+        self.people = people_df.set_index('person_id')
+        self._display_names = self.people['display_name'].to_dict()
+
+    def person_id(self, alias_type, alias, default=None):
+        """person_id of a single alias, e.g. person_id('email', 'Jane.Doe@abc.com ')."""
+        return self._lookup.get(alias_type, {}).get(str(alias).strip().lower(), default)
+
+    def map_series(self, alias_type, values):
+        """person_id for every value of a Series (<NA> where the alias is unknown)."""
+        lookup = self._lookup.get(alias_type, {})
+        return normalize_alias(values).map(lookup).astype('Int64')
+
+    def display_name(self, person_id):
+        return self._display_names.get(person_id, str(person_id))
+
+    def label(self, person_id):
+        """Display name with the account appended, since names are not unique."""
+        if person_id not in self.people.index:
+            return str(person_id)
+        account = self.people.at[person_id, 'account']
+        name = self._display_names[person_id]
+        return f"{name} ({account})" if pd.notna(account) and account != name else name
+
+
+def identity_available():
+    return os.path.exists(ALIASES_FILE) and os.path.exists(PEOPLE_FILE)
+
+
+@st.cache_resource
+def load_identity_index():
+    aliases_df = read_dataset(ALIASES_FILE)
+    people_df = read_dataset(PEOPLE_FILE)
+    return IdentityIndex(aliases_df, people_df)
@@ -0,0 +1,129 @@
+# loaders.py
+# Cached dataset loaders of the dashboard pages. They live in the data layer rather than in the
+# page scripts so that utils/warmup.py fills the same st.cache_data entries the pages read.
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import dataset_path, load_concurrently, read_dataset, read_datasets
+from utils.identity import load_identity_index
+from utils.path_trie import load_path_trie
+
+# Records in the whole answers log before Answers_log_cleaning.ipynb wrote monthly counts
+DEFAULT_TOTAL_RECORDS = 1436562
+
+
+@st.cache_data
+def load_error_log(file_path):
+    df = read_dataset(file_path)
+    if 'Start Timestamp' in df.columns:
+        df['Date'] = pd.to_datetime(df['Start Timestamp'])
+    elif 'Timestamp' in df.columns:
+        df['Date'] = pd.to_datetime(df['StartTimestamp'])
+    elif 'Error Date' in df.columns:
+        df['Date'] = pd.to_datetime(df['Error Date'])
+    return df
+
+
+@st.cache_data
+def load_total_records(counts_path):
+    """Records per month of the whole answers log, from pipelines/Answers_log_cleaning.ipynb, summed."""
+    if not os.path.exists(counts_path):
+        return DEFAULT_TOTAL_RECORDS
+    return int(read_dataset(counts_path)["records"].sum())
+
+
+@st.cache_data
+def load_notifications():
+    """Sent notifications and notifications joined to their tiles, with tile names on both."""
+    df1, df2 = read_datasets(
+        dataset_path("hub_notifications_transformed.csv"),
+        dataset_path("notifications_with_tiles.csv")
+    )
+
+    # Convert date columns to datetime
+    df1['start'] = pd.to_datetime(df1['start'], errors='coerce')
+    df1['end'] = pd.to_datetime(df1['end'], errors='coerce')
+    df2['start'] = pd.to_datetime(df2['start'], errors='coerce')
+    df2['end'] = pd.to_datetime(df2['end'], errors='coerce')
+
+    # Extract month and year for both dataframes
+    df1['month_year'] = df1['start'].dt.strftime('%b %Y')
+    df2['month_year'] = df2['start'].dt.strftime('%b %Y')
+
+    # Create a mapping from tile_id to tile_name using df2
+    tile_mapping = df2[['tile_id', 'tile_name']].drop_duplicates()
+    tile_id_to_name = dict(zip(tile_mapping['tile_id'].astype(str), tile_mapping['tile_name']))
+
+    # Map df1's tile (which contains tile_id) to tile_name using the mapping
+    df1['tile_name'] = df1['tile'].astype(str).map(tile_id_to_name)
+
+    return df1, df2
+
+
+@st.cache_data
+def load_sent_viewed_counters():
+    """Sent and viewed totals per (role, year, month) from pipelines/Sent_viewed_counters.ipynb."""
+    df_counters = read_dataset(dataset_path("sent_viewed_counters.csv"))
+    df_counters['Month'] = pd.PeriodIndex.from_fields(year=df_counters['year'], month=df_counters['month'], freq="M")
+    return df_counters
+
+
+def prepare_usage(df):
+    df['Start Timestamp'] = pd.to_datetime(df['Start Timestamp'], errors='coerce')
+    df['Subject Area Name'] = df['Subject Area Name'].fillna('Unknown')
+    df['Parsed Dashboard Name'] = df['Parsed Dashboard Name'].fillna('Unknown')
+    df['Parsed Source Path Name'] = df['Parsed Source Path Name'].fillna('Unknown')
+    df['Dashboard Page'] = df['Dashboard Page'].fillna('Unknown')
+    return df
+
+
+def prepare_binning(df):
+    df['Distinct Users'] = pd.to_numeric(df['Distinct Users'], errors='coerce')
+    df.dropna(subset=['Distinct Users'], inplace=True)
+    df['Dashboard Name Cleaned'] = df['Dashboard Name'].apply(lambda x: str(x).strip().split("/")[-1])
+    return df
+
+
+@st.cache_data
+def load_usage(file_path):
+    """Answers log and bin summary workbook of Dashboard_Trends, read side by side."""
+    df, df2 = load_concurrently(
+        lambda: read_dataset(file_path),
+        lambda: pd.read_excel(dataset_path("dashboard_usage_summary_by_bin 2.xlsx"), sheet_name="Sheet1")
+    )
+    return prepare_usage(df), prepare_binning(df2)
+
+
+@st.cache_data
+def load_journeys(file_path):
+    """User-level journey rows shared by User_Journey and User_Journey_Mapping."""
+    return read_dataset(file_path)
+
+
+@st.cache_data
+def load_labelled_journeys(file_path):
+    """Journey rows of User_Journey with person_id, readable step names and the folder of Step 1."""
+    df = load_journeys(file_path)
+    path_trie = load_path_trie()
+    identity = load_identity_index()
+
+    # Users are filtered on the resolved person_id; capstone_name is not unique
+    df['person_id'] = identity.map_series('account', df['User Name'])
+
+    for step in ['Step 1', 'Step 2', 'Step 3']:
+        df[step + '_Clean'] = path_trie.names(df[step]).where(df[step].notna(), "")
+
+    # Parent Path is the folder two levels down (/shared/<Parent Path>/...)
+    parent_ids = path_trie.ancestors_at_depth(path_trie.map_paths(df['Step 1']), 2)
+    df['Parent Path'] = pd.Series(path_trie.name[parent_ids.clip(min=0)], index=df.index).where(parent_ids >= 0, 'Other')
+    return df
+
+
+@st.cache_data
+def load_bin_transitions(file_path):
+    """Precomputed by pipelines/User_binning.ipynb: one row per (quarter pair, from bin, to bin)."""
+    df = read_dataset(file_path)
+    df['Quarter Pair'] = df['From Quarter'] + " → " + df['To Quarter']
+    return df
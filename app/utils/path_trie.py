@@ -0,0 +1,80 @@
+# path_trie.py
+# Folder hierarchy of catalog paths (/shared/Enterprise Analytics/_portal/...) built by
+# pipelines/Path_trie_index.ipynb. Every node carries precomputed counts and distinct users
+# for its whole subtree, so any folder's totals are an array lookup.
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import dataset_path, read_dataset
+
+TRIE_FILE = dataset_path("path_trie_nodes.csv")
+
+ROOT_ID = 0
+
+
+class PathTrie:
+    def __init__(self, nodes_df):
+        nodes_df = nodes_df.sort_values('node_id').reset_index(drop=True)
+        self.nodes = nodes_df
+        self.name = nodes_df['name'].fillna('').to_numpy(dtype=object)
+        self.depth = nodes_df['depth'].to_numpy()
+        self.parent = nodes_df['parent_id'].fillna(-1).astype(int).to_numpy()
+        self.path = nodes_df['path'].fillna('').to_numpy(dtype=object)
+        self.node_ids = pd.Series(nodes_df['node_id'].to_numpy(), index=self.path)
+
+        # Children of every node, sorted by name
+        by_parent = nodes_df[nodes_df['parent_id'].notna()].sort_values('name')
+        self._children = {
+            int(parent): group['node_id'].to_numpy()
+            for parent, group in by_parent.groupby('parent_id')
+        }
+
+    def map_paths(self, paths):
+        """Node id of every path in a Series (unknown paths map to the root)."""
+        return paths.map(self.node_ids).fillna(ROOT_ID).astype(int).to_numpy()
+
+    def names(self, paths):
+        """Last path component of every path in a Series. Unlike split('/')[-1] this keeps
+        escaped slashes ("\\/") inside a name."""
+        node_ids = paths.map(self.node_ids)
+        fallback = paths.astype(str).str.rsplit('/', n=1).str[-1]
+        known = node_ids.notna()
+        result = fallback.copy()
+        result[known] = self.name[node_ids[known].astype(int).to_numpy()]
+        return result
+
+    def ancestors_at_depth(self, node_ids, depth):
+        """Ancestor id at `depth` for every node id (-1 where the node is shallower)."""
+        node_ids = np.asarray(node_ids).copy()
+        result = np.where(self.depth[node_ids] >= depth, node_ids, -1)
+        active = result >= 0
+        while True:
+            climb = active & (self.depth[result.clip(min=0)] > depth)
+            if not climb.any():
+                return result
+            result[climb] = self.parent[result[climb]]
+
+    def children(self, node_id):
+        return self._children.get(node_id, np.array([], dtype=int))
+
+    def totals(self, node_id, source):
+        """(count, distinct users) for a node and its subtree, e.g. source='journey'."""
+        row = self.nodes.iloc[node_id]
+        return int(row[f'{source}_count']), int(row[f'{source}_users'])
+
+    def children_totals(self, node_id, source):
+        child_ids = self.children(node_id)
+        table = self.nodes.iloc[child_ids][['node_id', 'name', 'path', f'{source}_count', f'{source}_users']]
+        return table[table[f'{source}_count'] > 0]
+
+
+def trie_available():
+    return os.path.exists(TRIE_FILE)
+
+
+@st.cache_resource
+def load_path_trie():
+    return PathTrie(read_dataset(TRIE_FILE))
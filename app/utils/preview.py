@@ -0,0 +1,115 @@
+# preview.py
+# Estimates from the stratified samples written by sample_datasets.py. Every sample row carries
+# its stratum, the stratum's row count in the full dataset (N) and in the sample (n), and the
+# weight N / n. A count over any filtered subset of the sample is the sum of its weights; the
+# confidence interval comes from the per-stratum binomial variance, so strata kept whole add
+# no uncertainty. Pages run the same code on the full data, where every weight is 1.
+from collections import namedtuple
+
+import numpy as np
+
+STRATUM_COLUMN = "_stratum"
+STRATUM_ROWS_COLUMN = "_stratum_rows"
+SAMPLE_ROWS_COLUMN = "_sample_rows"
+WEIGHT_COLUMN = "_weight"
+SAMPLE_COLUMNS = [STRATUM_COLUMN, STRATUM_ROWS_COLUMN, SAMPLE_ROWS_COLUMN, WEIGHT_COLUMN]
+
+# Two-sided 95% normal interval
+Z_95 = 1.96
+
+Estimate = namedtuple("Estimate", ["value", "margin"])
+
+
+def is_sample(df):
+    return WEIGHT_COLUMN in df.columns
+
+
+def stratified_sample(df, strata, fraction, min_rows, seed=42):
+    """Rows of df drawn per stratum: `fraction` of each stratum but at least `min_rows` (the
+    whole stratum when smaller), with the columns the estimators need."""
+    keys = df[strata].astype("string").fillna("Unknown")
+    stratum = keys.groupby(strata, sort=True).ngroup().to_numpy()
+    stratum_rows = np.bincount(stratum)
+    sample_rows = np.minimum(stratum_rows, np.maximum(np.ceil(stratum_rows * fraction), min_rows)).astype(np.int64)
+
+    # A random rank within each stratum; the first n of each stratum are kept
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(len(df)), stratum))
+    first_of_stratum = np.concatenate([[0], np.cumsum(stratum_rows)[:-1]])
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[order] = np.arange(len(df)) - np.repeat(first_of_stratum, stratum_rows)
+    keep = np.sort(np.flatnonzero(rank < sample_rows[stratum]))
+
+    sample = df.iloc[keep].reset_index(drop=True)
+    kept_stratum = stratum[keep]
+    sample[STRATUM_COLUMN] = kept_stratum
+    sample[STRATUM_ROWS_COLUMN] = stratum_rows[kept_stratum]
+    sample[SAMPLE_ROWS_COLUMN] = sample_rows[kept_stratum]
+    sample[WEIGHT_COLUMN] = stratum_rows[kept_stratum] / sample_rows[kept_stratum]
+    return sample
+
+
+def estimate_count(df):
+    """Estimated number of full-data rows matching a filtered frame, with the 95% margin.
+    Exact (margin 0) on full data."""
+    if not is_sample(df):
+        return Estimate(len(df), 0.0)
+    if df.empty:
+        return Estimate(0.0, 0.0)
+    per_stratum = df.groupby(STRATUM_COLUMN).agg(
+        hits=(WEIGHT_COLUMN, "size"),
+        N=(STRATUM_ROWS_COLUMN, "first"),
+        n=(SAMPLE_ROWS_COLUMN, "first"),
+    )
+    share = per_stratum["hits"] / per_stratum["n"]
+    value = float((per_stratum["N"] * share).sum())
+    finite_population = 1 - per_stratum["n"] / per_stratum["N"]
+    variance = (
+        per_stratum["N"] ** 2 * finite_population * share * (1 - share) / (per_stratum["n"] - 1).clip(lower=1)
+    )
+    return Estimate(value, Z_95 * float(np.sqrt(variance.sum())))
+
+
+def weighted_size(df, by):
+    """groupby(by).size() scaled to the full data: sums of weights on a sample, plain row
+    counts otherwise."""
+    if not is_sample(df):
+        return df.groupby(by).size()
+    return df.groupby(by)[WEIGHT_COLUMN].sum()
+
+
+def weighted_value_counts(series, df):
+    """series.value_counts() scaled to the full data; series is a column of df."""
+    if not is_sample(df):
+        return series.value_counts()
+    return df[WEIGHT_COLUMN].groupby(series).sum().sort_values(ascending=False)
+
+
+def weighted_mode(series, df):
+    """series.mode() of the full data, estimated from the weights on a sample."""
+    if not is_sample(df):
+        return series.mode().iloc[0]
+    counts = weighted_value_counts(series, df)
+    return counts[counts == counts.max()].index.min()
+
+
+def scaled(estimate, factor):
+    return Estimate(estimate.value * factor, estimate.margin * factor)
+
+
+def format_estimate(estimate, fmt="{:,.0f}"):
+    """'1,234' for exact values, '≈1,234 ± 56' for sample estimates. fmt is a format string or
+    a function of the number."""
+    render = fmt if callable(fmt) else fmt.format
+    if not estimate.margin:
+        return render(estimate.value)
+    return f"≈{render(estimate.value)} ± {render(estimate.margin)}"
+
+
+def format_distinct(count, df):
+    """Distinct counts cannot be scaled from a sample; a sample only gives a lower bound."""
+    return f"≥{count:,}" if is_sample(df) else f"{count:,}"
+
+
+def drop_sample_columns(df):
+    return df.drop(columns=[column for column in SAMPLE_COLUMNS if column in df.columns])
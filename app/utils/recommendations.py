@@ -0,0 +1,64 @@
+# recommendations.py
+# "Users who open X next open Y" lookups over the index built by
+# pipelines/Journey_recommendation_index.ipynb. The index is stored sorted by context and
+# rank, so each context is a contiguous slice; lookups are a dict hit plus a k-row slice.
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import dataset_path
+
+INDEX_FILE = dataset_path("journey_next_dashboards.parquet")
+
+CONTEXT_COLUMNS = ['scope', 'scope_value', 'order', 'context_1', 'context_2']
+
+
+class NextDashboardIndex:
+    """First- and second-order Markov index of next dashboards."""
+
+    def __init__(self, index_df):
+        index_df = index_df.sort_values(CONTEXT_COLUMNS + ['rank'], na_position='last', kind='stable')
+        self.next = index_df['next'].to_numpy()
+        self.count = index_df['count'].to_numpy()
+        self.probability = index_df['probability'].to_numpy()
+
+        # Offsets of every context's slice, computed once at load time
+        contexts = index_df[CONTEXT_COLUMNS].fillna({'context_2': ''})
+        starts = np.flatnonzero(contexts.ne(contexts.shift()).any(axis=1).to_numpy())
+        ends = np.append(starts[1:], len(contexts))
+        first_rows = contexts.iloc[starts].itertuples(index=False, name=None)
+        self.offsets = {key: (start, end) for key, start, end in zip(first_rows, starts, ends)}
+
+    def top_next(self, dashboard, previous=None, k=5, scope='all', scope_value='All'):
+        """Top-k next dashboards after `dashboard` (or after `previous` -> `dashboard` when
+        given), as a DataFrame with next, count and probability columns."""
+        if previous is None:
+            key = (scope, scope_value, 1, dashboard, '')
+        else:
+            key = (scope, scope_value, 2, previous, dashboard)
+        start, end = self.offsets.get(key, (0, 0))
+        end = min(end, start + k)
+        return pd.DataFrame({
+            'next': self.next[start:end],
+            'count': self.count[start:end],
+            'probability': self.probability[start:end],
+        })
+
+    def dashboards(self, scope='all', scope_value='All'):
+        """Dashboards that have at least one recorded next step in a scope."""
+        return sorted(key[3] for key in self.offsets if key[:3] == (scope, scope_value, 1))
+
+    def previous_dashboards(self, dashboard, scope='all', scope_value='All'):
+        """Dashboards with a recorded second-order step through `dashboard` in a scope."""
+        return sorted(key[3] for key in self.offsets if key[:3] == (scope, scope_value, 2) and key[4] == dashboard)
+
+
+def index_available():
+    return os.path.exists(INDEX_FILE)
+
+
+@st.cache_resource
+def load_next_dashboard_index():
+    return NextDashboardIndex(pd.read_parquet(INDEX_FILE))
@@ -0,0 +1,36 @@
+# role_fanout.py
+# A notification tile reaches every user holding one of its roles. Rather than the full
+# notifications x users table, pipelines/03_notification_user_join.ipynb stores role membership
+# once. Send counts are precomputed by pipelines/Sent_viewed_counters.ipynb; per-user rows are
+# only expanded here when a drill-down asks for them.
+import os
+
+import pandas as pd
+import streamlit as st
+
+from utils.datasets import dataset_path, load_concurrently, read_dataset
+
+NOTIFICATIONS_FILE = dataset_path("notifications_with_tiles.csv")
+MEMBERS_FILE = dataset_path("role_members.parquet")
+
+
+def fanout_available():
+    return os.path.exists(NOTIFICATIONS_FILE) and os.path.exists(MEMBERS_FILE)
+
+
+@st.cache_data
+def load_role_fanout():
+    notifications, members = load_concurrently(
+        lambda: read_dataset(NOTIFICATIONS_FILE, parse_dates=['start', 'end']),
+        lambda: pd.read_parquet(MEMBERS_FILE)
+    )
+    return notifications, members
+
+
+def role_person_ids(members, role):
+    return members.loc[members['tile_roles'] == role, 'person_id'].dropna().unique()
+
+
+def expand_recipients(notifications, members):
+    """Per-user drill-down: one row per (notification row, user). Only call on a filtered slice."""
+    return notifications.merge(members, on='tile_roles', how='inner')
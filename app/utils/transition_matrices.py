@@ -0,0 +1,84 @@
+# transition_matrices.py
+# Query side of the journey transition matrices built by
+# pipelines/Journey_transition_matrices.ipynb. Each (quarter, week, title, bin) key owns one
+# row of a sparse matrix holding its flattened Step 1->2 and Step 2->3 adjacency matrices, so
+# the flows for any filter combination are a sparse row selection plus a sum.
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+import streamlit as st
+
+from utils.datasets import dataset_path, read_dataset
+
+PATHS_FILE = dataset_path("journey_paths.csv")
+KEYS_FILE = dataset_path("journey_matrix_keys.csv")
+MATRIX_FILE = dataset_path("journey_transitions.npz")
+
+KEY_COLUMNS = ['Quarter-Year', 'Week Number', 'title', 'Bin Category']
+FLOW_COLUMNS = ['layer', 'source', 'target', 'count']
+
+
+def matrices_available():
+    return all(os.path.exists(path) for path in (PATHS_FILE, KEYS_FILE, MATRIX_FILE))
+
+
+@st.cache_data
+def load_transition_matrices():
+    paths = read_dataset(PATHS_FILE)
+    keys = read_dataset(KEYS_FILE)
+    transitions = sp.load_npz(MATRIX_FILE).tocsr()
+    return paths, keys, transitions
+
+
+def cells_to_flows(cells, counts, n_paths):
+    """Decode flattened (layer, source, target) cell indices into a flow table."""
+    layer, rest = np.divmod(cells, n_paths * n_paths)
+    source, target = np.divmod(rest, n_paths)
+    return pd.DataFrame({'layer': layer, 'source': source, 'target': target, 'count': counts})
+
+
+def filtered_flows(paths, keys, transitions, filters):
+    """Sum the adjacency matrices of every key matching `filters` ({column: value}, 'All'
+    meaning no restriction) and return the non-zero flows."""
+    mask = np.ones(len(keys), dtype=bool)
+    for column, value in filters.items():
+        if value != 'All':
+            mask &= keys[column].to_numpy() == value
+    if not mask.any():
+        return pd.DataFrame(columns=FLOW_COLUMNS)
+
+    summed = sp.csr_matrix(mask.astype(transitions.dtype)) @ transitions
+    return cells_to_flows(summed.indices, summed.data, len(paths))
+
+
+@st.cache_data
+def load_filtered_flows(filters):
+    """filtered_flows over the stored matrices, cached per sidebar selection."""
+    paths, keys, transitions = load_transition_matrices()
+    return filtered_flows(paths, keys, transitions, filters)
+
+
+def flows_from_rows(df, paths):
+    """Same flow table computed directly from journey rows (used for per-user selections,
+    which the matrix keys do not cover)."""
+    path_ids = pd.Series(paths['path_id'].to_numpy(), index=paths['path'])
+    layers = []
+    for layer, (source, target) in enumerate([('Step 1', 'Step 2'), ('Step 2', 'Step 3')]):
+        layers.append(pd.DataFrame({
+            'layer': layer,
+            'source': df[source].map(path_ids).to_numpy(),
+            'target': df[target].map(path_ids).to_numpy(),
+            'count': df['Count'].to_numpy(),
+        }))
+    flows = pd.concat(layers, ignore_index=True).dropna()
+    return flows.groupby(['layer', 'source', 'target'], as_index=False)['count'].sum().astype('int64')
+
+
+def prune_flows(flows, min_count=1, max_edges=None):
+    """Drop edges below `min_count` and keep at most `max_edges` of the heaviest ones."""
+    flows = flows[flows['count'] >= min_count]
+    if max_edges is not None and len(flows) > max_edges:
+        flows = flows.nlargest(max_edges, 'count')
+    return flows
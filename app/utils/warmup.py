@@ -0,0 +1,119 @@
+# warmup.py
+# After a deploy or restart the first visitor of each page would pay for every file parse. The
+# warm-up loads every registered dataset, and the aggregates the pages show under their default
+# filters, on a background thread once per server process. The loaders are the cached functions
+# the pages call, so pages opened later read from the cache. Dashboard_Home starts it and reports
+# the readiness flag.
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+THREAD_NAME = "cache-warmup"
+
+# Filters every sidebar starts with
+DEFAULT_FLOW_FILTERS = {'title': 'All', 'Quarter-Year': 'All', 'Week Number': 'All', 'Bin Category': 'All'}
+
+
+def first_render_path(name):
+    """The file a page reads on first render: its preview sample when one is available."""
+    from utils.datasets import dataset_path, sample_available, sample_path
+
+    return sample_path(name) if sample_available(name) else dataset_path(name)
+
+
+def files_exist(*paths):
+    return all(os.path.exists(path) for path in paths)
+
+
+def warmup_tasks():
+    """(label, whether its files exist, loader) of everything warmed, shared indexes first."""
+    # Imported here, on the warm-up thread, so importing this module keeps Dashboard_Home light
+    from utils.datasets import dataset_path
+    from utils.identity import identity_available, load_identity_index
+    from utils.loaders import (
+        load_bin_transitions, load_error_log, load_journeys, load_labelled_journeys, load_notifications,
+        load_sent_viewed_counters, load_total_records, load_usage
+    )
+    from utils.path_trie import load_path_trie, trie_available
+    from utils.recommendations import index_available, load_next_dashboard_index
+    from utils.transition_matrices import load_filtered_flows, matrices_available
+
+    error_log = first_render_path("error_file_cleaned_1.csv")
+    answers_log = first_render_path("answers_log_cleaned_1.csv")
+    bin_summary = dataset_path("dashboard_usage_summary_by_bin 2.xlsx")
+    journeys = first_render_path("user_level_with_names.csv")
+    full_journeys = dataset_path("user_level_with_names.csv")
+    notifications = [dataset_path("hub_notifications_transformed.csv"), dataset_path("notifications_with_tiles.csv")]
+    counters = dataset_path("sent_viewed_counters.csv")
+    bin_transitions = dataset_path("bin_transition_matrix.csv")
+    return [
+        ("Identity index", identity_available(), load_identity_index),
+        ("Path trie", trie_available(), load_path_trie),
+        ("Error log", files_exist(error_log), lambda: load_error_log(error_log)),
+        ("Answers log record count", True, lambda: load_total_records(dataset_path("answers_log_monthly_counts.csv"))),
+        ("Notifications", files_exist(*notifications), load_notifications),
+        ("Sent vs viewed counters", files_exist(counters), load_sent_viewed_counters),
+        ("Dashboard usage", files_exist(answers_log, bin_summary), lambda: load_usage(answers_log)),
+        ("User journeys", files_exist(journeys), lambda: load_journeys(journeys)),
+        ("Labelled user journeys", files_exist(full_journeys) and trie_available() and identity_available(),
+         lambda: load_labelled_journeys(full_journeys)),
+        ("Journey flows", matrices_available(), lambda: load_filtered_flows(DEFAULT_FLOW_FILTERS)),
+        ("Next-dashboard index", index_available(), load_next_dashboard_index),
+        ("Bin transitions", files_exist(bin_transitions), lambda: load_bin_transitions(bin_transitions)),
+    ]
+
+
+class Warmup:
+    """Progress of the warm-up thread. `ready` is set once every task has run or been skipped."""
+
+    def __init__(self, task_factory):
+        self.task_factory = task_factory
+        self.tasks = []
+        self.loaded = []
+        self.skipped = []
+        self.failed = []
+        self.seconds = None
+        self.ready = threading.Event()
+
+    @property
+    def progress(self):
+        if not self.tasks:
+            return 0.0
+        return (len(self.loaded) + len(self.skipped) + len(self.failed)) / len(self.tasks)
+
+    def run(self):
+        start = time.perf_counter()
+        self.tasks = self.task_factory()
+        for label, available, loader in self.tasks:
+            if not available:
+                self.skipped.append(label)
+                continue
+            try:
+                loader()
+                self.loaded.append(label)
+            except Exception as e:
+                self.failed.append((label, str(e)))
+        self.seconds = time.perf_counter() - start
+        self.ready.set()
+
+
+class WithoutWarmupThread(logging.Filter):
+    """Drops the warm-up thread's "missing ScriptRunContext" warnings: it has no session on purpose."""
+
+    def filter(self, record):
+        return record.threadName != THREAD_NAME
+
+
+@st.cache_resource
+def start_warmup():
+    """Start the warm-up thread; runs once per server process however many sessions call it."""
+    warmup = Warmup(warmup_tasks)
+    # No script context is handed over: the caches are global, and with the context of the
+    # session that started it the loaders' spinners would be drawn into that visitor's page
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(WithoutWarmupThread())
+    thread = threading.Thread(target=warmup.run, name=THREAD_NAME, daemon=True)
+    thread.start()
+    return warmup
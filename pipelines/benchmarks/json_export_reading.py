@@ -0,0 +1,92 @@
+"""Benchmark: peak memory of pl.read_json vs the streaming export reader.
+
+Writes a synthetic Cosmos export of notification view logs and reads it in separate processes,
+so each peak RSS is measured on its own:
+
+    read_json      pl.read_json, then drop the Cosmos system fields (what the notebooks did)
+    stream         hub_ingest.read_export: bounded batches, system fields dropped per document
+    stream (1%)    hub_ingest.read_export with a watermark keeping the newest 1%, as in a
+                   daily incremental refresh
+
+    python pipelines/benchmarks/json_export_reading.py --docs 2000000
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+PIPELINES_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYSTEM_FIELDS = ['_rid', '_self', '_etag', '_attachments']
+FIRST_TS = 1_690_000_000
+
+
+def write_export(path, docs):
+    """A JSON array of view log documents shaped like hub_notifications_logs.json."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[\n')
+        for i in range(docs):
+            doc = {
+                'id': f'{i:08x}-4f2c-4b7e-9a51-{i:012x}',
+                'notification_id': f'n{i % 5000}',
+                'capstone_name': f'User {i % 20000}',
+                'capstone_email': f'user{i % 20000}@example.com',
+                'capstone_employee_id': 100000 + i % 20000,
+                'view_time_utc': str((FIRST_TS + i) * 1000),
+                '_rid': 'Vq1tAJ3x2dQBAAAAAAAAAA==',
+                '_self': 'dbs/Vq1tAA==/colls/Vq1tAJ3x2dQ=/docs/Vq1tAJ3x2dQBAAAAAAAAAA==/',
+                '_etag': '"0b00b5f1-0000-0200-0000-6502a6b30000"',
+                '_attachments': 'attachments/',
+                '_ts': FIRST_TS + i,
+            }
+            f.write(('' if i == 0 else ',\n') + json.dumps(doc))
+        f.write('\n]\n')
+
+
+def measure(mode, path, docs):
+    """Child process: read the export one way and report rows, seconds and peak RSS (MB)."""
+    sys.path.insert(0, PIPELINES_DIR)
+    import polars as pl
+    from hub_ingest import read_export
+
+    start = time.perf_counter()
+    if mode == 'read_json':
+        df = pl.read_json(path).drop(SYSTEM_FIELDS)
+    elif mode == 'stream':
+        df = read_export(path)
+    else:
+        df = read_export(path, watermark=FIRST_TS + docs - docs // 100)
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps({'rows': df.height, 'seconds': elapsed, 'peak_mb': peak_mb}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docs', type=int, default=2_000_000)
+    parser.add_argument('--measure', choices=['read_json', 'stream', 'stream_watermark'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.path, args.docs)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hub_notifications_logs.json')
+        write_export(path, args.docs)
+        print(f"{args.docs:,} documents, {os.path.getsize(path) / 2**20:,.0f} MB export\n")
+        for mode, label in [('read_json', 'pl.read_json'), ('stream', 'stream'), ('stream_watermark', 'stream (newest 1%)')]:
+            result = subprocess.run(
+                [sys.executable, __file__, '--measure', mode, '--path', path, '--docs', str(args.docs)],
+                capture_output=True, text=True, check=True
+            )
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f"{label:<22} {stats['rows']:>12,} rows {stats['seconds']:8.1f}s {stats['peak_mb']:10,.0f} MB peak")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: per-row map_elements timestamp conversion vs native polars expressions.
+
+Compares the conversions used by 01_notification_transformation.ipynb (epoch millis) and
+Notification_views.ipynb (mixed epoch/ISO 8601 view times) on synthetic view logs, and checks
+that both produce the same timestamps.
+
+    python pipelines/benchmarks/timestamp_parsing.py --rows 10000000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import polars as pl
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from notification_stages import parse_mixed_timestamp
+
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+# -------------------- Previous per-row conversions --------------------
+def convert_epoch_millis(x):
+    return datetime.utcfromtimestamp(x / 1000).strftime(TIME_FORMAT)
+
+
+def convert_mixed_timestamp(ts: str):
+    try:
+        ts_float = float(ts)
+        ts_int = int(ts_float)
+        dt = datetime.utcfromtimestamp(ts_int / 1000)
+        return dt.strftime(TIME_FORMAT)
+    except:
+        try:
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            return dt.strftime(TIME_FORMAT)
+        except:
+            return None
+
+
+def synthetic_view_logs(rows, seed=0):
+    """Half epoch-millis strings, half ISO 8601 (with and without fractions or seconds), ~1% garbage."""
+    rng = np.random.default_rng(seed)
+    millis = rng.integers(1_685_000_000_000, 1_735_000_000_000, rows)
+    kind = rng.integers(0, 100, rows)
+    df = pl.DataFrame({'millis': millis, 'kind': kind})
+    iso = pl.from_epoch('millis', time_unit='ms')
+    return df.select(
+        'millis',
+        pl.when(pl.col('kind') < 50).then(pl.col('millis').cast(pl.String))
+        .when(pl.col('kind') < 75).then(iso.dt.strftime('%Y-%m-%dT%H:%M:%S%.3fZ'))
+        .when(pl.col('kind') < 90).then(iso.dt.strftime('%Y-%m-%dT%H:%M:%SZ'))
+        .when(pl.col('kind') < 95).then(iso.dt.strftime('%Y-%m-%dT%H:%MZ'))
+        .when(pl.col('kind') < 99).then(iso.dt.strftime('%Y-%m-%d %H:%M'))
+        .otherwise(pl.lit('not a timestamp'))
+        .alias('view_time_utc'),
+    )
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    df = synthetic_view_logs(args.rows)
+    print(f"{args.rows:,} synthetic view logs\n")
+
+    old_epoch, t_old_epoch = timed("epoch millis: map_elements",
+                                   lambda: df.select(pl.col('millis').map_elements(convert_epoch_millis, return_dtype=pl.String)))
+    new_epoch, t_new_epoch = timed("epoch millis: pl.from_epoch",
+                                   lambda: df.select(pl.from_epoch('millis', time_unit='ms')))
+
+    old_mixed, t_old_mixed = timed("mixed formats: map_elements",
+                                   lambda: df.select(pl.col('view_time_utc').map_elements(convert_mixed_timestamp, return_dtype=pl.String)))
+    # The expression Notification_views.ipynb applies, imported from notification_stages
+    new_mixed, t_new_mixed = timed("mixed formats: coalesced str.to_datetime",
+                                   lambda: df.select(parse_mixed_timestamp('view_time_utc')))
+
+    # Same instants once formatted the way the CSVs are written
+    assert old_epoch.to_series().equals(new_epoch.to_series().dt.strftime(TIME_FORMAT))
+    assert old_mixed.to_series().equals(new_mixed.to_series().dt.strftime(TIME_FORMAT))
+
+    print(f"\nspeedup: epoch millis {t_old_epoch / t_new_epoch:,.0f}x, mixed formats {t_old_mixed / t_new_mixed:,.0f}x")
+
+
+if __name__ == '__main__':
+    main()
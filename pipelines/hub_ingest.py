@@ -0,0 +1,211 @@
+"""Incremental ingestion of the Analytics Hub Cosmos exports.
+
+Each export is kept as a partitioned Parquet store under data/transformed/hub/<source>/, one
+partition per month of the Cosmos `_ts` (seconds since epoch) of the last update of a document:
+
+    hub/hub_notifications_logs/ts_month=2024-11/part.parquet
+    hub/hub_notifications_logs/_manifest.json
+
+The manifest holds the source's high-water `_ts`. A refresh only takes documents updated at or
+after it and upserts them by `id`. `_ts` has one-second precision, so documents of the
+watermark second are taken again: one updated in that second after the previous export was
+taken would otherwise never be picked up. The partitions receiving new documents and the partitions holding
+older versions of them are rewritten, every other partition is left alone. Exports without
+`_ts` or `id` replace their store whole when the file changes. Documents deleted in Cosmos stay in the store; run with full_refresh
+to rebuild from scratch.
+
+Pipelines read the stores with `scan_hub` instead of the raw JSON. Paths are relative to the
+pipelines folder, like the notebooks.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import polars as pl
+
+from json_stream import iter_batches
+
+HUB_STORE_DIR = '../data/transformed/hub'
+
+HUB_SOURCES = {
+    'hub_notifications': '../data/raw/hub_notifications.json',
+    'hub_notifications_logs': '../data/raw/hub_notifications_logs.json',
+    'hub_users': '../data/raw/hub_users.json',
+    'tiles': '../data/raw/tiles.json',
+}
+
+# Cosmos bookkeeping fields no pipeline uses; `_ts` is kept for the watermark
+COSMOS_SYSTEM_FIELDS = ['_rid', '_self', '_etag', '_attachments']
+
+PARTITION_COLUMN = 'ts_month'
+UNPARTITIONED = 'all'
+
+
+def source_dir(source):
+    return os.path.join(HUB_STORE_DIR, source)
+
+
+def manifest_path(source):
+    return os.path.join(source_dir(source), '_manifest.json')
+
+
+def partition_path(source, partition):
+    return os.path.join(source_dir(source), f'{PARTITION_COLUMN}={partition}', 'part.parquet')
+
+
+def load_manifest(source):
+    path = manifest_path(source)
+    if not os.path.exists(path):
+        return {'watermark': None, 'rows': 0, 'partitions': []}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(source, manifest):
+    tmp_path = manifest_path(source) + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path(source))
+
+
+def read_export(path, watermark=None):
+    """Documents of an export without the Cosmos system fields, streamed in bounded batches.
+    With `watermark`, only documents updated at or after it are kept, so memory holds one batch plus
+    the new documents rather than the whole export."""
+    frames = []
+    # Keeps the columns when no document reaches the watermark
+    empty = None
+    for batch in iter_batches(path, exclude=COSMOS_SYSTEM_FIELDS):
+        df = pl.from_arrow(batch)
+        if '_ts' in df.columns:
+            df = df.with_columns(pl.col('_ts').cast(pl.Int64))
+            if watermark is not None:
+                # >=: `_ts` is in whole seconds, and upserting a document again is harmless
+                df = df.filter(pl.col('_ts') >= watermark)
+        if empty is None:
+            empty = df.clear()
+        if df.height:
+            frames.append(df)
+    if frames:
+        return pl.concat(frames, how='diagonal_relaxed')
+    return empty if empty is not None else pl.DataFrame()
+
+
+def scan_hub(source):
+    """All current documents of a source. Partitions are concatenated with relaxed schemas, so
+    a column that is missing or all-null in some months does not break the scan."""
+    manifest = load_manifest(source)
+    if not manifest['partitions']:
+        raise FileNotFoundError(f"No ingested data for {source}; run hub_ingest.ingest_all() first")
+    return pl.concat(
+        [pl.scan_parquet(partition_path(source, partition)) for partition in manifest['partitions']],
+        how='diagonal_relaxed'
+    )
+
+
+def with_partition(df):
+    return df.with_columns(pl.from_epoch('_ts', time_unit='s').dt.strftime('%Y-%m').alias(PARTITION_COLUMN))
+
+
+def write_partition(source, partition, df):
+    path = partition_path(source, partition)
+    if df.is_empty():
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.write_parquet(path + '.tmp', compression='zstd')
+    os.replace(path + '.tmp', path)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def replace_source(source, docs, export_sha256):
+    """Exports without `_ts` or `id` cannot be upserted; they replace the store whole."""
+    shutil.rmtree(source_dir(source), ignore_errors=True)
+    write_partition(source, UNPARTITIONED, docs)
+    save_manifest(source, {
+        'watermark': None,
+        'export_sha256': export_sha256,
+        'rows': docs.height,
+        'partitions': [UNPARTITIONED] if docs.height else [],
+    })
+    print(f"{source}: no _ts/id to upsert on, {docs.height} documents replaced")
+    return docs.height
+
+
+def ingest_source(source, raw_path, full_refresh=False):
+    """Upsert the documents of `raw_path` updated at or after the source's watermark.
+    Returns the number of documents written."""
+    if full_refresh:
+        shutil.rmtree(source_dir(source), ignore_errors=True)
+    os.makedirs(source_dir(source), exist_ok=True)
+    manifest = load_manifest(source)
+
+    # Stores replaced whole are only re-read when their export changed
+    export_sha256 = file_sha256(raw_path) if 'export_sha256' in manifest else None
+    if export_sha256 is not None and manifest['export_sha256'] == export_sha256:
+        print(f"{source}: export unchanged")
+        return 0
+
+    docs = read_export(raw_path, watermark=manifest['watermark'])
+    if '_ts' not in docs.columns or 'id' not in docs.columns:
+        return replace_source(source, docs, export_sha256 or file_sha256(raw_path))
+
+    if docs.is_empty():
+        print(f"{source}: up to date (watermark {manifest['watermark']})")
+        return 0
+
+    # Latest version of each document
+    docs = with_partition(docs.sort('_ts').unique('id', keep='last', maintain_order=True))
+    incoming_ids = docs['id']
+
+    # Partitions receiving documents, and partitions holding older versions of them
+    touched = set(docs[PARTITION_COLUMN].unique().to_list())
+    for partition in manifest['partitions']:
+        ids = pl.read_parquet(partition_path(source, partition), columns=['id'])['id']
+        if ids.is_in(incoming_ids).any():
+            touched.add(partition)
+
+    for partition in sorted(touched):
+        frames = []
+        if partition in manifest['partitions']:
+            existing = pl.read_parquet(partition_path(source, partition))
+            frames.append(existing.filter(~pl.col('id').is_in(incoming_ids)))
+        frames.append(docs.filter(pl.col(PARTITION_COLUMN) == partition).drop(PARTITION_COLUMN))
+        write_partition(source, partition, pl.concat(frames, how='diagonal_relaxed'))
+
+    partitions = sorted(
+        partition for partition in set(manifest['partitions']) | touched
+        if os.path.exists(partition_path(source, partition))
+    )
+    rows = sum(pl.scan_parquet(partition_path(source, partition)).select(pl.len()).collect().item()
+               for partition in partitions)
+    save_manifest(source, {'watermark': docs['_ts'].max(), 'rows': rows, 'partitions': partitions})
+    print(f"{source}: {docs.height} documents upserted into {len(touched)} partitions, {rows} stored")
+    return docs.height
+
+
+def ingest_all(full_refresh=False):
+    """Ingest every Hub export that is present."""
+    for source, raw_path in HUB_SOURCES.items():
+        if os.path.exists(raw_path):
+            ingest_source(source, raw_path, full_refresh=full_refresh)
+        else:
+            print(f"{source}: {raw_path} not found, skipped")
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--full-refresh', action='store_true', help='rebuild the stores from the full exports')
+    args = parser.parse_args()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    ingest_all(full_refresh=args.full_refresh)
@@ -0,0 +1,104 @@
+"""Streaming reader for the Cosmos JSON array exports.
+
+`pl.read_json` and `json.load` hold the whole array, and every field of every document, in
+memory before anything is dropped. These readers walk the array one document at a time with a
+bounded text buffer, drop unwanted fields per document and hand out Arrow record batches, so
+peak memory is one batch however large the export grows.
+
+Cosmos documents have no fixed schema. Each batch gets the union of its documents' fields, so
+a field missing from the first document is kept. Arrow types a field by its first value, while
+`pl.read_json` reads a field that mixes JSON numbers, booleans and strings (e.g. `view_time_utc`
+holding epoch ints and ISO strings) as String, and booleans mixed with numbers as numbers. Such
+fields are unified the same way per batch before Arrow sees them.
+"""
+import json
+import re
+
+import pyarrow as pa
+
+CHUNK_SIZE = 1 << 20
+BATCH_SIZE = 50_000
+
+# Whitespace and the commas between array elements
+SEPARATOR = re.compile(r'[\s,]*')
+
+
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """Documents of a JSON array file, decoded one at a time."""
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8-sig') as f:
+        buffer = f.read(chunk_size).lstrip()
+        eof = not buffer
+        if not buffer.startswith('['):
+            raise ValueError(f"{path} is not a JSON array")
+        pos = 1
+        while True:
+            pos = SEPARATOR.match(buffer, pos).end()
+            if pos == len(buffer):
+                if eof:
+                    raise ValueError(f"{path} ends inside the array")
+                chunk = f.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            if buffer[pos] == ']':
+                return
+            if buffer[pos] != '{':
+                raise ValueError(f"{path} holds a non-object array element")
+            try:
+                # An object cut off by the end of the buffer never decodes, so a
+                # successful decode is always the whole document
+                doc, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+                continue
+            yield doc
+
+
+def unify_mixed_scalars(batch):
+    """Give fields mixing scalar types one type, as `pl.read_json` does, in place: with strings
+    the other scalars become their JSON text, with numbers booleans become 0 and 1."""
+    types = {}
+    for doc in batch:
+        for column, value in doc.items():
+            if value is not None:
+                types.setdefault(column, set()).add(type(value))
+    scalar = {column: seen for column, seen in types.items() if len(seen) > 1 and not seen & {dict, list}}
+    stringified = [column for column, seen in scalar.items() if str in seen]
+    numeric = [column for column, seen in scalar.items() if str not in seen and bool in seen]
+    for doc in batch:
+        for column in stringified:
+            value = doc.get(column)
+            if value is not None and not isinstance(value, str):
+                doc[column] = json.dumps(value)
+        for column in numeric:
+            value = doc.get(column)
+            if isinstance(value, bool):
+                doc[column] = int(value)
+    return batch
+
+
+def to_record_batch(batch):
+    """Record batch of documents with the union of their fields, in order of first appearance."""
+    columns = list(dict.fromkeys(column for doc in batch for column in doc))
+    return pa.RecordBatch.from_struct_array(pa.array(unify_mixed_scalars(batch))).select(columns)
+
+
+def iter_batches(path, columns=None, exclude=(), batch_size=BATCH_SIZE):
+    """Arrow record batches of a JSON array export. `columns` keeps only those fields (missing
+    ones become null); otherwise the fields in `exclude` are dropped."""
+    batch = []
+    for doc in iter_json_array(path):
+        if columns is not None:
+            doc = {column: doc.get(column) for column in columns}
+        else:
+            for column in exclude:
+                doc.pop(column, None)
+        batch.append(doc)
+        if len(batch) == batch_size:
+            yield to_record_batch(batch)
+            batch = []
+    if batch:
+        yield to_record_batch(batch)
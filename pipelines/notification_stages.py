@@ -0,0 +1,143 @@
+"""Lazy stages of the notification pipeline.
+
+01_notification_transformation, 02_notification_tile_join and 03_notification_user_join each
+wrap one of these functions. Every stage takes and returns LazyFrames, so chaining them builds
+a single query plan: polars pushes the dropped columns down into the scans, plans the joins as a
+whole and can execute it streaming. `run_notification_pipeline` collects the chained stages
+once; the intermediate CSVs are only written when asked for. Notification_views parses the view
+times of the logs with `parse_mixed_timestamp`.
+
+The Hub exports are read from the stores kept by hub_ingest.py. Paths are relative to the
+pipelines folder, like the notebooks.
+"""
+import os
+
+import polars as pl
+
+from hub_ingest import scan_hub
+
+IDENTITY_ALIASES_PATH = '../data/transformed/identity_aliases.csv'
+
+NOTIFICATIONS_TRANSFORMED_PATH = '../data/transformed/hub_notifications_transformed.csv'
+NOTIFICATIONS_TILES_PATH = '../data/transformed/notifications_with_tiles.csv'
+ROLE_MEMBERS_PATH = '../data/transformed/role_members.parquet'
+
+CSV_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# The Cosmos system fields other than _ts are already dropped at ingestion
+NOTIFICATION_COLUMNS_TO_DROP = [
+    'type', 'classification', 'role', 'created_date', 'updated_date',
+    'created_by', '_ts', 'updated_by'
+]
+
+
+# -------------------- 01: notification transformation --------------------
+def transform_notifications(notifications):
+    return (
+        notifications
+        .drop(NOTIFICATION_COLUMNS_TO_DROP)
+        .explode('tile')
+        # Time difference in days (milliseconds to days)
+        .with_columns(((pl.col('end') - pl.col('start')) / (1000 * 60 * 60 * 24)).alias('time_diff_days'))
+        # Major notifications stay up for more than two days
+        .with_columns(
+            pl.when(pl.col('time_diff_days') > 2)
+            .then(pl.lit('major'))
+            .otherwise(pl.lit('minor'))
+            .alias('notification_type')
+        )
+        # Epoch milliseconds to (UTC) datetimes
+        .with_columns(
+            pl.from_epoch('start', time_unit='ms'),
+            pl.from_epoch('end', time_unit='ms')
+        )
+    )
+
+
+# -------------------- 02: tile join --------------------
+def join_tiles(notifications, tiles):
+    tiles_exploded = (
+        tiles.select(
+            pl.col('id').alias('tile_id'),
+            pl.col('name').alias('tile_name'),
+            pl.col('description').alias('tile_description'),
+            pl.col('roles').alias('tile_roles'),
+            pl.col('source').alias('tile_source')
+        )
+        .explode('tile_roles')
+    )
+    return (
+        notifications
+        .with_columns(pl.col('tile').alias('tile_id'))
+        .join(tiles_exploded, on='tile_id', how='inner')
+        .drop('tile')
+    )
+
+
+# -------------------- 03: role membership --------------------
+def role_members(users, identity_aliases):
+    """One row per (role, user) with the user's person_id from Identity_resolution.ipynb."""
+    email_ids = (
+        identity_aliases
+        .filter(pl.col('alias_type') == 'email')
+        .select(pl.col('alias').alias('email_key'), 'person_id')
+    )
+    return (
+        users.select(
+            pl.col('capstone_email'),
+            pl.col('jobtitle'),
+            pl.col('authorization').struct.field('role').alias('tile_roles')
+        )
+        .with_columns(pl.col('capstone_email').str.strip_chars().str.to_lowercase().alias('email_key'))
+        .join(email_ids, on='email_key', how='left')
+        .drop('email_key')
+        .filter(pl.col('tile_roles').is_not_null())
+        .unique(['tile_roles', 'capstone_email'], keep='first', maintain_order=True)
+        .sort('tile_roles', 'person_id')
+    )
+
+
+# -------------------- View times --------------------
+def parse_mixed_timestamp(column):
+    """Epoch milliseconds or ISO 8601 strings to datetimes; null where neither format parses.
+    The ISO offset is dropped and the wall time kept, as datetime.fromisoformat + strftime did."""
+    raw = pl.col(column).cast(pl.String)
+    iso = raw.str.replace(r'(Z|[+-]\d{2}:?\d{2})$', '')
+    epoch_ms = raw.cast(pl.Float64, strict=False).cast(pl.Int64, strict=False)
+    return pl.coalesce(
+        pl.from_epoch(epoch_ms, time_unit='ms').cast(pl.Datetime('us')),
+        iso.str.to_datetime('%Y-%m-%dT%H:%M:%S%.f', strict=False),
+        iso.str.to_datetime('%Y-%m-%d %H:%M:%S%.f', strict=False),
+        # fromisoformat also takes times without seconds
+        iso.str.to_datetime('%Y-%m-%dT%H:%M', strict=False),
+        iso.str.to_datetime('%Y-%m-%d %H:%M', strict=False),
+        iso.str.to_date('%Y-%m-%d', strict=False).cast(pl.Datetime('us')),
+    )
+
+
+def notification_plans():
+    """The three stages chained from the ingested Hub exports, as lazy plans keyed by output."""
+    transformed = transform_notifications(scan_hub('hub_notifications'))
+    return {
+        'hub_notifications_transformed': transformed,
+        'notifications_with_tiles': join_tiles(transformed, scan_hub('tiles')),
+        'role_members': role_members(scan_hub('hub_users'), pl.scan_csv(IDENTITY_ALIASES_PATH)),
+    }
+
+
+def run_notification_pipeline(write_intermediates=False, streaming=False):
+    """Collect the fused plan once and write its outputs. The 01 output
+    (hub_notifications_transformed.csv) is only needed for debugging and is skipped unless
+    `write_intermediates` is set; `streaming` runs the plan in batches to bound memory."""
+    plans = notification_plans()
+    if not write_intermediates:
+        plans.pop('hub_notifications_transformed')
+
+    frames = dict(zip(plans, pl.collect_all(list(plans.values()), streaming=streaming)))
+
+    os.makedirs(os.path.dirname(NOTIFICATIONS_TILES_PATH), exist_ok=True)
+    if 'hub_notifications_transformed' in frames:
+        frames['hub_notifications_transformed'].write_csv(NOTIFICATIONS_TRANSFORMED_PATH, datetime_format=CSV_DATETIME_FORMAT)
+    frames['notifications_with_tiles'].write_csv(NOTIFICATIONS_TILES_PATH, datetime_format=CSV_DATETIME_FORMAT)
+    frames['role_members'].write_parquet(ROLE_MEMBERS_PATH, compression='zstd')
+    return frames
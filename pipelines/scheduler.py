@@ -0,0 +1,376 @@
+"""DAG scheduler for the pipeline notebooks.
+
+Every stage declares the files it reads and writes. A stage depends on the stages that write
+its inputs; stages with no path between them run in parallel worker processes. A stage is
+skipped when its code and the content of its inputs are unchanged since its last successful
+run and its outputs still exist.
+
+Notebooks run in-process: their code cells are executed in order, in a fresh namespace, with
+the pipelines folder as working directory, so there is no Jupyter kernel to start. Pass
+--kernel to run them through nbclient instead.
+
+    python pipelines/scheduler.py                 # build what changed
+    python pipelines/scheduler.py --dry-run       # show what would run
+    python pipelines/scheduler.py Combined_views  # also rerun Combined_views
+    python pipelines/scheduler.py --all           # rerun everything
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+
+PIPELINES_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = '../data/transformed/.pipeline_state.json'
+
+RAW = '../data/raw/'
+TRANSFORMED = '../data/transformed/'
+# Manifests of the Hub stores kept by hub_ingest.py; they change whenever a store does
+HUB = TRANSFORMED + 'hub/'
+HUB_SOURCES = ['hub_notifications', 'hub_notifications_logs', 'hub_users', 'tiles']
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: list
+    outputs: list
+    # Inputs the stage uses only if they exist (Identity_resolution's optional sources)
+    optional_inputs: list = field(default_factory=list)
+    notebook: str = None
+    # 'module:function' for stages that are plain Python, resolved in the worker
+    function: str = None
+
+
+STAGES = [
+    Stage('Hub_ingestion', function='hub_ingest:ingest_all',
+          inputs=[],
+          optional_inputs=[RAW + source + '.json' for source in HUB_SOURCES],
+          outputs=[HUB + source + '/_manifest.json' for source in HUB_SOURCES]),
+    Stage('Answers_log_cleaning', notebook='Answers_log_cleaning.ipynb',
+          inputs=[RAW + 'answers_log.csv'],
+          outputs=[TRANSFORMED + 'answers_log_cleaned/_manifest.json', TRANSFORMED + 'answers_log_cleaned_1.csv',
+                   TRANSFORMED + 'answers_log_monthly_counts.csv']),
+    Stage('Error_classification', notebook='Error_classification.ipynb',
+          inputs=[RAW + 'answers_log.csv'],
+          outputs=[TRANSFORMED + 'error_file_cleaned_1.csv']),
+    Stage('Journey_sessionization', notebook='Journey_sessionization.ipynb',
+          inputs=[RAW + 'answers_log.csv'],
+          optional_inputs=[TRANSFORMED + 'user_weekly_bins.parquet'],
+          outputs=[TRANSFORMED + 'journey_weekly_triples.parquet', TRANSFORMED + 'journey_session_tail.parquet',
+                   TRANSFORMED + 'journey_user_titles.parquet', TRANSFORMED + 'final_user_level_bin_transitions.csv']),
+    Stage('User_binning', notebook='User_binning.ipynb',
+          inputs=[RAW + 'answers_log.csv'],
+          outputs=[TRANSFORMED + 'user_weekly_activity.parquet', TRANSFORMED + 'user_weekly_bins.parquet',
+                   TRANSFORMED + 'bin_transition_matrix.csv']),
+    Stage('Journey_transition_matrices', notebook='Journey_transition_matrices.ipynb',
+          inputs=[TRANSFORMED + 'user_level_with_names.csv'],
+          outputs=[TRANSFORMED + 'journey_paths.csv', TRANSFORMED + 'journey_matrix_keys.csv',
+                   TRANSFORMED + 'journey_transitions.npz']),
+    Stage('Journey_recommendation_index', notebook='Journey_recommendation_index.ipynb',
+          inputs=[TRANSFORMED + 'user_level_with_names.csv'],
+          outputs=[TRANSFORMED + 'journey_next_dashboards.parquet']),
+    Stage('Path_trie_index', notebook='Path_trie_index.ipynb',
+          inputs=[TRANSFORMED + 'user_level_with_names.csv', TRANSFORMED + 'error_file_cleaned_1.csv'],
+          outputs=[TRANSFORMED + 'path_trie_nodes.csv']),
+    Stage('Identity_resolution', notebook='Identity_resolution.ipynb',
+          inputs=[],
+          optional_inputs=[TRANSFORMED + 'user_level_with_names.csv', TRANSFORMED + 'error_file_cleaned_1.csv',
+                           RAW + 'associate_export.parquet', HUB + 'hub_users/_manifest.json',
+                           HUB + 'hub_notifications_logs/_manifest.json', RAW + 'tableau_logs.csv'],
+          outputs=[TRANSFORMED + 'identity_aliases.csv', TRANSFORMED + 'identity_people.csv']),
+    # 01 → 02 → 03 as one fused lazy query
+    Stage('notification_stages', function='notification_stages:run_notification_pipeline',
+          inputs=[HUB + 'hub_notifications/_manifest.json', HUB + 'tiles/_manifest.json',
+                  HUB + 'hub_users/_manifest.json', TRANSFORMED + 'identity_aliases.csv'],
+          outputs=[TRANSFORMED + 'notifications_with_tiles.csv', TRANSFORMED + 'role_members.parquet']),
+    Stage('Notification_views', notebook='Notification_views.ipynb',
+          inputs=[HUB + 'hub_notifications_logs/_manifest.json'],
+          outputs=[TRANSFORMED + 'hub_notifications_logs_transformed.csv']),
+    Stage('Combined_views', notebook='Combined_views.ipynb',
+          inputs=[TRANSFORMED + 'hub_notifications_logs_transformed.csv', TRANSFORMED + 'notifications_with_tiles.csv',
+                  TRANSFORMED + 'role_members.parquet', TRANSFORMED + 'identity_aliases.csv'],
+          outputs=[TRANSFORMED + 'Combined_views.parquet']),
+    Stage('Sent_viewed_counters', notebook='Sent_viewed_counters.ipynb',
+          inputs=[TRANSFORMED + 'notifications_with_tiles.csv', TRANSFORMED + 'role_members.parquet',
+                  TRANSFORMED + 'Combined_views.parquet'],
+          outputs=[TRANSFORMED + 'sent_viewed_counters.csv']),
+]
+
+
+# -------------------- DAG --------------------
+def producers_of(stages):
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producers:
+                raise ValueError(f"{path} is written by both {producers[path]} and {stage.name}")
+            producers[path] = stage.name
+    return producers
+
+
+def build_dag(stages, include_optional=True):
+    """Upstream stage names of every stage. Stages that read their own outputs (incremental
+    notebooks) do not depend on themselves."""
+    producers = producers_of(stages)
+    return {
+        stage.name: {producers[path] for path in stage.inputs + (stage.optional_inputs if include_optional else [])
+                     if path in producers and producers[path] != stage.name}
+        for stage in stages
+    }
+
+
+def topological_order(dag):
+    order, done = [], set()
+    remaining = dict(dag)
+    while remaining:
+        ready = sorted(name for name, upstream in remaining.items() if upstream <= done)
+        if not ready:
+            raise ValueError(f"Cycle between stages: {', '.join(sorted(remaining))}")
+        order.extend(ready)
+        done.update(ready)
+        for name in ready:
+            del remaining[name]
+    return order
+
+
+# -------------------- Fingerprints --------------------
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FingerprintCache:
+    """Content hashes of files, rehashed only when their size or mtime changes."""
+
+    def __init__(self, entries=None):
+        self.entries = entries if entries is not None else {}
+
+    def fingerprint(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        cached = self.entries.get(path)
+        if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+            return cached['sha256']
+        sha = file_sha256(path)
+        self.entries[path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': sha}
+        return sha
+
+
+def local_imports(source):
+    """Modules of the pipelines folder that `source` imports."""
+    names = set()
+    # Notebook cells may hold magics; a cell that does not parse imports nothing we can see
+    for cell in source.split('\n#%%\n'):
+        try:
+            tree = ast.parse(cell)
+        except SyntaxError:
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names.add(node.module.split('.')[0])
+    return {name for name in names if os.path.exists(name + '.py')}
+
+
+def code_hash(stage):
+    """Hash of the code a stage runs: a notebook's code cells (not its outputs) or the source
+    of the module holding the function, plus every pipelines module they import, directly or
+    through another one (hub_ingest, notification_stages, ...)."""
+    if stage.notebook:
+        with open(stage.notebook, encoding='utf-8') as f:
+            cells = json.load(f)['cells']
+        source = '\n#%%\n'.join(''.join(cell['source']) for cell in cells if cell['cell_type'] == 'code')
+        seen = set()
+    else:
+        module_name = stage.function.split(':')[0]
+        with open(module_name + '.py', encoding='utf-8') as f:
+            source = f.read()
+        seen = {module_name}
+
+    modules = {}
+    pending = local_imports(source) - seen
+    while pending:
+        name = pending.pop()
+        seen.add(name)
+        with open(name + '.py', encoding='utf-8') as f:
+            modules[name] = f.read()
+        pending |= local_imports(modules[name]) - seen
+
+    digest = hashlib.sha256(source.encode('utf-8'))
+    for name in sorted(modules):
+        digest.update(f'\n#%% {name}.py\n{modules[name]}'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_state():
+    if not os.path.exists(STATE_PATH):
+        return {'files': {}, 'stages': {}}
+    with open(STATE_PATH, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_PATH), exist_ok=True)
+    tmp_path = STATE_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, STATE_PATH)
+
+
+# -------------------- Execution --------------------
+def run_notebook_in_process(notebook_path):
+    """Execute a notebook's code cells in order in a fresh namespace."""
+    with open(notebook_path, encoding='utf-8') as f:
+        cells = json.load(f)['cells']
+    namespace = {'__name__': '__main__'}
+    for number, cell in enumerate(cells):
+        if cell['cell_type'] == 'code':
+            exec(compile(''.join(cell['source']), f"{notebook_path}[{number}]", 'exec'), namespace)
+
+
+def run_notebook_in_kernel(notebook_path):
+    import nbclient
+    import nbformat
+
+    with open(notebook_path, 'r', encoding='utf-8') as f:
+        nb = nbformat.read(f, as_version=4)
+    nbclient.NotebookClient(nb=nb, timeout=600, kernel_name='python3').execute()
+
+
+def run_stage(stage, kernel=False):
+    """Worker entry point. Returns the elapsed seconds."""
+    os.chdir(PIPELINES_DIR)
+    if PIPELINES_DIR not in sys.path:
+        sys.path.insert(0, PIPELINES_DIR)
+    start = time.perf_counter()
+    if stage.function:
+        module_name, function_name = stage.function.split(':')
+        getattr(importlib.import_module(module_name), function_name)()
+    elif kernel:
+        run_notebook_in_kernel(stage.notebook)
+    else:
+        run_notebook_in_process(stage.notebook)
+    return time.perf_counter() - start
+
+
+def run_pipeline(stages=None, workers=None, force=(), dry_run=False, kernel=False):
+    """Run the stages that are out of date, in dependency order. `force` names stages to run
+    regardless of their fingerprints (True for all). Returns {stage name: status}."""
+    stages = stages or STAGES
+    workers = workers or os.cpu_count() or 1
+    by_name = {stage.name: stage for stage in stages}
+    producers = producers_of(stages)
+    dag = build_dag(stages)
+    # Only required inputs hold a stage back when their producer fails
+    required_dag = build_dag(stages, include_optional=False)
+    order = topological_order(dag)
+
+    previous_cwd = os.getcwd()
+    os.chdir(PIPELINES_DIR)
+    try:
+        state = load_state()
+        cache = FingerprintCache(state['files'])
+        status = {}
+
+        def fingerprints(stage):
+            return {path: cache.fingerprint(path) for path in sorted(set(stage.inputs + stage.optional_inputs))}
+
+        def plan(name):
+            """Status of a stage whose upstream stages are done, or its state record if it has to run."""
+            stage = by_name[name]
+            # An upstream stage without its raw inputs leaves its last outputs in place to build on
+            if any(status[upstream] in ('failed', 'blocked') for upstream in required_dag[name]):
+                return 'blocked', None
+            missing = [path for path in stage.inputs
+                       if not os.path.exists(path) and status.get(producers.get(path)) != 'would run']
+            if missing:
+                return f"missing {', '.join(os.path.relpath(path, '../data') for path in missing)}", None
+            if not stage.inputs and not any(os.path.exists(path) for path in stage.optional_inputs):
+                return 'missing all inputs', None
+            record = {'code': code_hash(stage), 'inputs': fingerprints(stage)}
+            up_to_date = (
+                force is not True and name not in force
+                and state['stages'].get(name) == record
+                and all(os.path.exists(path) for path in stage.outputs)
+                # A dry run cannot know what upstream stages that would run will write
+                and not any(status[upstream] == 'would run' for upstream in dag[name])
+            )
+            if up_to_date:
+                return 'skipped', None
+            if dry_run:
+                return 'would run', None
+            return None, record
+
+        pending = list(order)
+        running = {}
+        context = multiprocessing.get_context('spawn')
+        # Workers are only started once a stage is submitted, so a no-op rebuild spawns nothing
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as pool:
+            while pending or running:
+                done = {n for n, s in status.items() if s != 'running'}
+                for name in [n for n in pending if dag[n] <= done]:
+                    pending.remove(name)
+                    status[name], record = plan(name)
+                    if record is not None:
+                        print(f"Running {name}")
+                        status[name] = 'running'
+                        running[pool.submit(run_stage, by_name[name], kernel)] = (name, record)
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, record = running.pop(future)
+                    try:
+                        elapsed = future.result()
+                    except Exception as e:
+                        print(f"Error in {name}: {e}")
+                        status[name] = 'failed'
+                        continue
+                    status[name] = 'ran'
+                    state['stages'][name] = record
+                    print(f"Completed {name} in {elapsed:.1f}s")
+                save_state(state)
+        save_state(state)
+    finally:
+        os.chdir(previous_cwd)
+
+    for name in order:
+        print(f"{name:<30} {status[name]}")
+    return status
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('force', nargs='*', help='stages to run even if up to date')
+    parser.add_argument('--all', action='store_true', help='run every stage')
+    parser.add_argument('--workers', type=int, default=None, help='parallel worker processes (default: CPU count)')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would run')
+    parser.add_argument('--kernel', action='store_true', help='run notebooks through a Jupyter kernel')
+    args = parser.parse_args()
+
+    unknown = set(args.force) - {stage.name for stage in STAGES}
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    status = run_pipeline(workers=args.workers, force=True if args.all else args.force,
+                          dry_run=args.dry_run, kernel=args.kernel)
+    print(f"\nPipeline finished in {time.perf_counter() - start:.2f}s")
+    sys.exit(1 if 'failed' in status.values() else 0)
+
+
+if __name__ == '__main__':
+    main()
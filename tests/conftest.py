@@ -0,0 +1,21 @@
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The pipelines and the app import their modules as top-level ones, as they do when run from their folder
+sys.path.insert(0, os.path.join(ROOT, 'pipelines'))
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+
+
+@pytest.fixture
+def write_export(tmp_path):
+    """Writes documents as a JSON array export under tmp_path and returns its path."""
+    def write(name, docs):
+        path = tmp_path / name
+        path.write_text(json.dumps(docs), encoding='utf-8')
+        return str(path)
+    return write
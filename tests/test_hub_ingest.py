@@ -0,0 +1,18 @@
+import hub_ingest
+
+
+def test_update_in_the_watermark_second_is_picked_up(tmp_path, monkeypatch, write_export):
+    monkeypatch.setattr(hub_ingest, 'HUB_STORE_DIR', str(tmp_path / 'hub'))
+    docs = [
+        {'id': 'a', 'title': 'Release notes', '_ts': 1730419200},
+        {'id': 'b', 'title': 'Outage', '_ts': 1730419260},
+    ]
+    hub_ingest.ingest_source('hub_notifications', write_export('hub_notifications.json', docs))
+
+    # Updated within the same second as the previous export's high-water mark
+    docs[1]['title'] = 'Outage resolved'
+    hub_ingest.ingest_source('hub_notifications', write_export('hub_notifications.json', docs))
+
+    stored = hub_ingest.scan_hub('hub_notifications').collect().sort('id')
+    assert stored['title'].to_list() == ['Release notes', 'Outage resolved']
+    assert hub_ingest.load_manifest('hub_notifications')['rows'] == 2
@@ -0,0 +1,20 @@
+import pytest
+
+import import_budget
+
+
+@pytest.fixture(scope='module')
+def baseline():
+    return import_budget.measure_baseline()
+
+
+@pytest.mark.parametrize('page', sorted(import_budget.PAGE_BUDGETS_MS))
+def test_page_import_block_within_budget(page, baseline):
+    page_times, forbidden = import_budget.measure_page(page, baseline)
+
+    assert not forbidden, f"{page} imports {', '.join(forbidden)} before drawing anything"
+    page_ms = sum(page_times.values()) / 1000
+    assert page_ms <= import_budget.PAGE_BUDGETS_MS[page], (
+        f"{page} import block takes {page_ms:.0f}ms: "
+        + ', '.join(f"{name} {us / 1000:.0f}ms" for name, us in sorted(page_times.items(), key=lambda item: -item[1])[:5])
+    )
@@ -0,0 +1,56 @@
+import polars as pl
+
+import hub_ingest
+from json_stream import iter_batches
+
+# hub_notifications_logs exports hold view times both as epoch ints and as ISO strings
+MIXED_LOGS = [
+    {'id': 'a', 'notification_id': 'n1', 'view_time_utc': 1730419200000, 'read': False, '_ts': 1730419200},
+    {'id': 'b', 'notification_id': 'n1', 'view_time_utc': '2024-11-01T09:30:00Z', 'read': None, '_ts': 1730453400},
+    {'id': 'c', 'notification_id': 'n2', 'view_time_utc': None, 'read': True, '_ts': 1730539800},
+    {'id': 'd', 'notification_id': 'n2', 'view_time_utc': 1730540000000, 'read': 'yes', '_ts': 1730540000},
+]
+
+
+def test_mixed_scalar_fields_read_as_strings_like_read_json(write_export):
+    path = write_export('logs.json', MIXED_LOGS)
+    expected = pl.read_json(path)
+
+    for batch_size in (len(MIXED_LOGS), 1):
+        frames = [pl.from_arrow(batch) for batch in iter_batches(path, batch_size=batch_size)]
+        df = pl.concat(frames, how='diagonal_relaxed').select(expected.columns)
+        assert df.schema['view_time_utc'] == pl.String
+        assert df['view_time_utc'].to_list() == expected['view_time_utc'].to_list()
+        assert df['read'].to_list() == expected['read'].to_list()
+
+
+def test_ingest_mixed_type_export(tmp_path, monkeypatch, write_export):
+    monkeypatch.setattr(hub_ingest, 'HUB_STORE_DIR', str(tmp_path / 'hub'))
+    path = write_export('hub_notifications_logs.json', MIXED_LOGS)
+
+    assert hub_ingest.ingest_source('hub_notifications_logs', path) == len(MIXED_LOGS)
+    stored = hub_ingest.scan_hub('hub_notifications_logs').collect().sort('id')
+    assert stored['view_time_utc'].to_list() == ['1730419200000', '2024-11-01T09:30:00Z', None, '1730540000000']
+
+
+def test_fields_missing_from_the_first_document_are_kept(tmp_path, monkeypatch, write_export):
+    monkeypatch.setattr(hub_ingest, 'HUB_STORE_DIR', str(tmp_path / 'hub'))
+    docs = [
+        {'id': '1', '_ts': 1730419200, 'role': 'a'},
+        {'id': '2', '_ts': 1730419260, 'role': 'b', 'optional_field': 'X'},
+    ]
+    path = write_export('hub_notifications.json', docs)
+
+    hub_ingest.ingest_source('hub_notifications', path)
+    stored = hub_ingest.scan_hub('hub_notifications').collect().sort('id')
+    assert stored['optional_field'].to_list() == pl.read_json(path).sort('id')['optional_field'].to_list()
+
+
+def test_booleans_mixed_with_numbers_read_like_read_json(write_export):
+    docs = [{'flag': True, 'score': True}, {'flag': 1, 'score': 2.5}, {'flag': False, 'score': None}]
+    path = write_export('docs.json', docs)
+    expected = pl.read_json(path)
+
+    df = pl.from_arrow(next(iter_batches(path)))
+    assert df.schema == expected.schema
+    assert df.to_dicts() == expected.to_dicts()
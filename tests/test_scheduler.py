@@ -0,0 +1,19 @@
+import json
+
+from scheduler import Stage, code_hash
+
+
+def test_code_hash_follows_imported_pipeline_modules(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'helpers.py').write_text('from parsing import parse\n', encoding='utf-8')
+    (tmp_path / 'parsing.py').write_text('def parse(x):\n    return x\n', encoding='utf-8')
+    notebook = {'cells': [
+        {'cell_type': 'code', 'source': ['import polars as pl\n', 'from helpers import parse']},
+        {'cell_type': 'code', 'source': ['%time parse(1)']},
+    ]}
+    (tmp_path / 'Stage.ipynb').write_text(json.dumps(notebook), encoding='utf-8')
+    stage = Stage('Stage', inputs=[], outputs=[], notebook='Stage.ipynb')
+
+    before = code_hash(stage)
+    (tmp_path / 'parsing.py').write_text('def parse(x):\n    return x.strip()\n', encoding='utf-8')
+    assert code_hash(stage) != before